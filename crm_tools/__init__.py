@@ -0,0 +1,5 @@
+"""Shared helpers for the frontend codemod and page generator scripts.
+
+Every fixer and generator is a module here with a `main(argv)`; run them as
+`python -m crm_tools COMMAND` or in-process with `crm_tools.cli.run`.
+"""
@@ -0,0 +1,314 @@
+"""
+Staged, all-or-nothing file writes with a rollback journal.
+
+Scripts never write pages in place. `stage(path, content)` writes the new
+text to a temp file next to the target (same directory, so same filesystem)
+and returns its path, or None when the file already holds that text, so
+unchanged pages are never touched. Staging is safe in worker processes;
+the parent then commits everything in one `Batch`:
+
+1. every file about to be replaced is hard-linked (or copied) into the
+   journal directory and the journal is written;
+2. each temp file is renamed over its target with os.replace.
+
+A crash or Ctrl-C before step 2 leaves the tree untouched. After step 2 the
+journal holds the previous state of the last run, which
+
+    python -m crm_tools.atomic rollback DIR
+
+puts back. The journal lives in `DIR/.write-journal` and only covers the
+most recent batch committed under DIR.
+
+Temp files a run staged but never committed (it crashed or was
+interrupted) are removed by the next batch that writes into the same
+directory. A temp file is named after the process that started its run,
+which worker processes inherit through the environment, and is only
+removed once that process has exited.
+
+Inside `capture()` stage() writes nothing and keeps the text in memory,
+which is how --diff previews (crm_tools.preview) run the same tasks.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+
+JOURNAL_NAME = '.write-journal'
+JOURNAL_VERSION = 1
+TEMP_SUFFIX = '.crm-tmp'
+WRITE_BUFFER = 1 << 16
+
+# The process that started this run; workers inherit it
+RUN_PID = int(os.environ.setdefault('CRM_TOOLS_RUN_PID', str(os.getpid())))
+_TEMP_NAME = re.compile(r'\.(\d+)(?:-\d+)?' + re.escape(TEMP_SUFFIX) + '$')
+
+_captured = None
+# Without a liveness check (not POSIX), temp files older than this process
+# are taken to be abandoned
+_STARTED = time.time()
+
+
+def _same_text(path, content):
+    try:
+        with open(path, 'r', encoding='utf-8', newline=None) as f:
+            return f.read() == content
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+@contextmanager
+def capture():
+    """Within the block, stage() keeps text in the yielded {path: content} dict
+    and returns `path`, instead of writing a temp file (dry runs)"""
+    global _captured
+    previous, _captured = _captured, {}
+    try:
+        yield _captured
+    finally:
+        _captured = previous
+
+
+def _temp_path(path):
+    directory = os.path.dirname(path) or '.'
+    return os.path.join(directory, f'.{os.path.basename(path)}.{RUN_PID}-{os.getpid()}{TEMP_SUFFIX}')
+
+
+def stage(path, content):
+    """Write `content` next to `path` and return the temp path, or None if unchanged"""
+    if _same_text(path, content):
+        return None
+    if _captured is not None:
+        _captured[path] = content
+        return path
+    tmp_path = _temp_path(path)
+    try:
+        f = open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(tmp_path), exist_ok=True)
+        f = open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER)
+    try:
+        with f:
+            f.write(content)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    return tmp_path
+
+
+def _same_file_text(path, other, chunk_size=1 << 16):
+    """Whether two files hold the same text, read in chunks"""
+    try:
+        with open(path, 'r', encoding='utf-8', newline=None) as a, \
+                open(other, 'r', encoding='utf-8', newline=None) as b:
+            while True:
+                chunk = a.read(chunk_size)
+                if chunk != b.read(chunk_size):
+                    return False
+                if not chunk:
+                    return True
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def stage_stream(path, chunks):
+    """stage() for text produced in pieces: each chunk is written as it comes,
+    so the new text is never held whole. Returns the temp path, or None if unchanged"""
+    if _captured is not None:
+        return stage(path, ''.join(chunks))
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        discard(tmp_path)
+        raise
+    if _same_file_text(path, tmp_path):
+        discard(tmp_path)
+        return None
+    return tmp_path
+
+
+def discard(tmp_path):
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def journal_dir(base_path):
+    return os.path.join(base_path, JOURNAL_NAME)
+
+
+def _running(pid):
+    if pid == RUN_PID:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, but belongs to someone else
+    return True
+
+
+def sweep_stale(directories, keep=()):
+    """Remove temp files left in `directories` by runs that never committed.
+
+    Files of a run whose process is still alive are left alone, as are
+    those in `keep`; returns how many were removed.
+    """
+    keep = {os.path.normpath(path) for path in keep}
+    removed = 0
+    for directory in directories:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            match = _TEMP_NAME.search(name)
+            if not (name.startswith('.') and match):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.path.normpath(path) in keep:
+                    continue
+                if os.name == 'posix':
+                    if _running(int(match.group(1))):
+                        continue
+                elif os.stat(path).st_mtime >= _STARTED:
+                    continue
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+    return removed
+
+
+class Batch:
+    """Staged writes committed together under one journal.
+
+    Used as a context manager, the batch commits when the block finishes and
+    discards every staged file if it raises.
+    """
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.staged = []  # (target path, temp path)
+
+    def add(self, path, tmp_path):
+        if tmp_path is not None:
+            self.staged.append((path, tmp_path))
+
+    def write(self, path, content):
+        """Stage `content` for `path`; False when the file already has it"""
+        tmp_path = stage(path, content)
+        self.add(path, tmp_path)
+        return tmp_path is not None
+
+    def abort(self):
+        for _, tmp_path in self.staged:
+            discard(tmp_path)
+        self.staged = []
+
+    def commit(self):
+        """Journal the current files, then move every staged file into place"""
+        if not self.staged:
+            return 0
+        sweep_stale({os.path.dirname(path) or '.' for path, _ in self.staged},
+                    {tmp_path for _, tmp_path in self.staged})
+        directory = journal_dir(self.base_path)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+        entries = []
+        for index, (path, tmp_path) in enumerate(self.staged):
+            backup = None
+            if os.path.exists(path):
+                backup = f'{index}.bak'
+                try:
+                    os.link(path, os.path.join(directory, backup))
+                except OSError:
+                    shutil.copy2(path, os.path.join(directory, backup))
+                shutil.copymode(path, tmp_path)
+            entries.append({'path': os.path.abspath(path), 'backup': backup})
+        _write_json(os.path.join(directory, 'journal.json'), {
+            'version': JOURNAL_VERSION, 'created': time.time(), 'entries': entries,
+        })
+
+        for path, tmp_path in self.staged:
+            os.replace(tmp_path, path)
+        count = len(self.staged)
+        self.staged = []
+        return count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def commit_results(results, base_path):
+    """Commit the files staged by a run's FileResults; discard them on failure"""
+    batch = Batch(base_path)
+    for result in results:
+        batch.add(result.path, result.staged)
+    try:
+        return batch.commit()
+    except BaseException:
+        batch.abort()
+        raise
+
+
+def rollback(base_path):
+    """Restore the files changed by the last committed batch; returns how many"""
+    directory = journal_dir(base_path)
+    try:
+        with open(os.path.join(directory, 'journal.json'), 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+    except (OSError, ValueError):
+        return None
+    for entry in reversed(journal['entries']):
+        if entry['backup'] is None:
+            if os.path.exists(entry['path']):
+                os.remove(entry['path'])
+        else:
+            os.replace(os.path.join(directory, entry['backup']), entry['path'])
+    shutil.rmtree(directory, ignore_errors=True)
+    return len(journal['entries'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Undo the last batch of writes under a directory')
+    parser.add_argument('command', choices=['rollback'])
+    parser.add_argument('base_path', help='directory the script wrote into (its --base-path)')
+    args = parser.parse_args(argv)
+
+    restored = rollback(args.base_path)
+    if restored is None:
+        print(f'[SKIP] No journal in {journal_dir(args.base_path)}')
+        return 1
+    print(f'[DONE] Restored {restored} files')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Benchmarks for the codemod and generator scripts.
+
+Synthesizes a services tree of N modules x M pages using the shapes the
+fixers target (`accessorKey`, `row.original.*`, `ConfirmDialog trigger={...}`,
+`const { data: x, isLoading } = useX(`), then times each script's per-file
+entry point on a fresh copy of the tree. Every case runs in its own process
+so peak RSS is per case. Results are written as JSON for later comparison.
+
+Usage:
+    python -m crm_tools.bench [--modules N] [--pages M] [--size BYTES]
+                              [--output FILE] [--compare OLD.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from crm_tools.rewrite import PROPERTY_MAP
+
+KINDS = ('list', 'edit', 'view')
+
+LIST_HEADER = """'use client';
+
+import { useState } from 'react';
+import { ColumnDef } from '@tanstack/react-table';
+import { Button } from '@/components/ui/button';
+import { ConfirmDialog } from '@/components/shared/ConfirmDialog';
+import { Eye, Pencil, Trash2 } from 'lucide-react';
+
+export default function {name}Page() {
+  const columns: ColumnDef<{name}>[] = [
+"""
+
+LIST_COLUMN = """    {
+      accessorKey: '{snake}',
+      header: '{label}',
+      cell: ({ row }) => <span>{row.original.{snake}}</span>,
+    },
+"""
+
+LIST_FOOTER = """    {
+      id: 'actions',
+      header: 'Actions',
+      cell: ({ row }) => (
+        <div className="flex items-center gap-2">
+          <Button variant="ghost" size="sm" onClick={() => router.push(`/x/${row.original.id}`)}>
+            <Eye className="h-4 w-4" />
+          </Button>
+          <Button variant="ghost" size="sm" onClick={() => router.push(`/x/${row.original.id}/edit`)}>
+            <Pencil className="h-4 w-4" />
+          </Button>
+          <ConfirmDialog
+            title="Delete {name}"
+            description="Are you sure you want to delete this item? This action cannot be undone."
+            onConfirm={() => deleteItem(row.original.id)}
+            trigger={
+              <Button variant="ghost" size="sm" disabled={isDeleting}>
+                <Trash2 className="h-4 w-4 text-red-600" />
+              </Button>
+            }
+          />
+        </div>
+      ),
+    },
+  ];
+
+  return <DataTable columns={columns} data={data} />;
+}
+"""
+
+EDIT_HEADER = """'use client';
+
+import { useEffect } from 'react';
+
+export default function Edit{name}Page() {
+  const { data: item, isLoading } = use{name}(id);
+
+  useEffect(() => {
+    if (item) {
+      const formData = {
+"""
+
+EDIT_FIELD = "        {snake}: itemData.{snake} || '',\n"
+
+EDIT_FOOTER = """      };
+      form.reset(formData);
+    }
+  }, [item]);
+
+  return <form />;
+}
+"""
+
+VIEW_HEADER = """'use client';
+
+export default function {name}DetailsPage() {
+  const { data: item, isLoading } = use{name}(id);
+
+  return (
+    <div>
+"""
+
+VIEW_FIELD = "      <p className=\"text-sm\">{item.{snake}}</p>\n"
+
+VIEW_FOOTER = """      <p>{item.city.city_name}</p>
+    </div>
+  );
+}
+"""
+
+SHAPES = {
+    'list': (LIST_HEADER, LIST_COLUMN, LIST_FOOTER),
+    'edit': (EDIT_HEADER, EDIT_FIELD, EDIT_FOOTER),
+    'view': (VIEW_HEADER, VIEW_FIELD, VIEW_FOOTER),
+}
+
+
+def _fill(template, **values):
+    for key, value in values.items():
+        template = template.replace('{' + key + '}', value)
+    return template
+
+
+def synth_page(kind, name, size):
+    """Render a page of roughly `size` bytes in the shape a fixer targets"""
+    header, repeat, footer = SHAPES[kind]
+    parts = [_fill(header, name=name)]
+    total = len(parts[0]) + len(footer)
+    keys = list(PROPERTY_MAP)
+    i = 0
+    while total < size or i < len(keys):
+        snake = keys[i % len(keys)]
+        chunk = _fill(repeat, snake=snake, label=snake.replace('_', ' ').title())
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    parts.append(_fill(footer, name=name))
+    return ''.join(parts)
+
+
+def page_path(base_path, module, k, kind):
+    parts = {'list': ('page.tsx',), 'edit': ('[id]', 'edit', 'page.tsx'), 'view': ('[id]', 'page.tsx')}[kind]
+    return os.path.join(base_path, module, f'p{k}', *parts)
+
+
+def synth_tree(base_path, modules, pages, size):
+    """Write N modules x M pages under base_path; returns [(path, kind, module)]"""
+    files = []
+    for m in range(modules):
+        module = f'module-{m:04d}'
+        name = f'Module{m}'
+        for k in range(pages):
+            kind = KINDS[k % len(KINDS)]
+            path = page_path(base_path, module, k, kind)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(synth_page(kind, name, size))
+            files.append((path, kind, module))
+    return files
+
+
+def _peak_rss_kb():
+    """Peak RSS of this process or any worker it waited for, in KiB
+
+    Call it after the worker pool has shut down; RUSAGE_CHILDREN only
+    counts children that have been reaped.
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _tasks(case, files):
+    """Per-file tasks for one benchmark case"""
+    if case == 'fix_services':
+        from crm_tools import fix_services
+        funcs = {'list': fix_services.fix_list_page, 'edit': fix_services.fix_edit_page,
+                 'view': fix_services.fix_view_page}
+        return [(funcs[kind], path) for path, kind, _ in files]
+    if case == 'fix_pages':
+        from crm_tools import fix_pages
+        return [(fix_pages.fix_page, path, module) for path, kind, module in files if kind == 'list']
+    if case == 'fix_actions':
+        from crm_tools import fix_actions
+        return [(fix_actions.fix_actions, path, module) for path, kind, module in files if kind == 'list']
+    if case == 'pipeline':
+        from crm_tools.pipeline import run_file
+        return [(run_file, path, kind) for path, kind, _ in files]
+    raise ValueError(f'unknown case {case!r}')
+
+
+def _run_fixer_case(case, pristine, files, jobs):
+    from crm_tools.atomic import commit_results
+    from crm_tools.runner import run_tasks
+
+    workdir = tempfile.mkdtemp(prefix=f'bench-{case}-')
+    try:
+        tree = os.path.join(workdir, 'services')
+        shutil.copytree(pristine, tree)
+        files = [(path.replace(pristine, tree, 1), kind, module) for path, kind, module in files]
+        tasks = _tasks(case, files)
+        size = sum(os.path.getsize(task[1]) for task in tasks)
+
+        start = time.perf_counter()
+        results = run_tasks(tasks, jobs)
+        commit_results(results, tree)
+        seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'name': case,
+        'files': len(tasks),
+        'bytes': size,
+        'seconds': seconds,
+        'files_per_sec': len(tasks) / seconds if seconds else None,
+        'changed': sum(1 for r in results if r.status == 'fixed'),
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def _run_generator_case(modules):
+    from crm_tools import generate_services_pages as generator
+    template_config = next(iter(generator.MODULES.values()))
+    catalogue = {f'module-{m:04d}': dict(template_config, singular=f'Module {m}', plural=f'Module {m}s')
+                 for m in range(modules)}
+
+    workdir = tempfile.mkdtemp(prefix='bench-generate-')
+    try:
+        start = time.perf_counter()
+        written, _ = generator.generate(workdir, modules=catalogue, force=True)
+        seconds = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(workdir, rel_path)) for rel_path, _ in written)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'name': 'generate_services_pages',
+        'files': len(written),
+        'bytes': size,
+        'seconds': seconds,
+        'files_per_sec': len(written) / seconds if seconds else None,
+        'changed': len(written),
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+FIXER_CASES = ('fix_services', 'fix_pages', 'fix_actions', 'pipeline')
+CASES = FIXER_CASES + ('generate_services_pages',)
+
+
+def run_benchmarks(modules, pages, size, cases=CASES, jobs=1):
+    """Run each case in a fresh process and return the list of results"""
+    workdir = tempfile.mkdtemp(prefix='bench-tree-')
+    try:
+        pristine = os.path.join(workdir, 'services')
+        files = synth_tree(pristine, modules, pages, size)
+        results = []
+        for case in cases:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                if case == 'generate_services_pages':
+                    future = executor.submit(_run_generator_case, modules)
+                else:
+                    future = executor.submit(_run_fixer_case, case, pristine, files, jobs)
+                results.append(future.result())
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_table(results, baseline=None):
+    previous = {r['name']: r for r in (baseline or {}).get('results', [])}
+    print(f"{'case':<26}{'files':>8}{'seconds':>10}{'files/s':>12}{'peak RSS':>12}{'vs base':>10}")
+    for r in results:
+        rss = f"{r['peak_rss_kb'] / 1024:.1f}M" if r['peak_rss_kb'] is not None else '-'
+        rate = f"{r['files_per_sec']:.0f}" if r['files_per_sec'] else '-'
+        delta = '-'
+        old = previous.get(r['name'])
+        if old and old.get('files_per_sec') and r['files_per_sec']:
+            delta = f"{r['files_per_sec'] / old['files_per_sec']:.2f}x"
+        print(f"{r['name']:<26}{r['files']:>8}{r['seconds']:>10.3f}{rate:>12}{rss:>12}{delta:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the codemod and generator scripts')
+    parser.add_argument('--modules', type=int, default=20, help='number of synthetic modules (default: 20)')
+    parser.add_argument('--pages', type=int, default=3, help='pages per module (default: 3)')
+    parser.add_argument('--size', type=int, default=8192, help='approximate bytes per page (default: 8192)')
+    parser.add_argument('--case', action='append', dest='cases', choices=CASES, help='only run this case (repeatable)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='worker processes for the fixer cases')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.modules, args.pages, args.size, args.cases or CASES, args.jobs)
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'modules': args.modules, 'pages': args.pages, 'size': args.size, 'jobs': args.jobs},
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f'[OK] Results written to {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Per-file time budget for codemod work.
+
+The runner opens a budget around every file it processes. Long-running scans
+call `check_budget()` periodically; once the budget is spent it raises
+`BudgetExceeded` and the runner reports the file and moves on instead of
+letting one pathological page hang the whole run.
+"""
+
+import time
+from contextlib import contextmanager
+
+_deadline = None
+
+
+class BudgetExceeded(Exception):
+    """Raised when a file takes longer than its time budget"""
+
+
+@contextmanager
+def time_budget(seconds):
+    """Limit the work inside the block to `seconds` (None means unlimited)"""
+    global _deadline
+    previous = _deadline
+    _deadline = None if seconds is None else time.monotonic() + seconds
+    try:
+        yield
+    finally:
+        _deadline = previous
+
+
+def check_budget():
+    if _deadline is not None and time.monotonic() > _deadline:
+        raise BudgetExceeded('time budget exceeded')
@@ -0,0 +1,36 @@
+"""
+Per-user cache directory shared by the crm_tools scripts.
+
+Everything lives under `$XDG_CACHE_HOME/crm-tools` (`~/.cache/...` by
+default), never in the page trees. Each kind of cache keeps its own
+versioned subdirectory (e.g. the prefilter verdicts); all of it can be
+deleted at any time and only costs a rescan.
+
+Usage:
+    python -m crm_tools.cache clear
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+
+def cache_root():
+    """Per-user directory for everything crm_tools caches"""
+    root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'crm-tools')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the crm_tools cache directory')
+    parser.add_argument('command', choices=['clear'])
+    parser.parse_args(argv)
+
+    shutil.rmtree(cache_root(), ignore_errors=True)
+    print(f'[DONE] Cleared {cache_root()}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
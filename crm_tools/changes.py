@@ -0,0 +1,154 @@
+"""
+Git-aware `--since REV` selection for the codemods and generators.
+
+Instead of walking the whole services tree, a run can be limited to pages
+that differ from a revision (tracked changes via `git diff-index` against
+the index and working tree, plus untracked files), and to inputs whose
+value changed: PROPERTY_MAP for the fixers, MODULES entries and
+TEMPLATE_VERSION for the generators. Values are compared as Python
+literals read with `ast`, so reformatting a file does not count as a change.
+Those inputs are read from the checkout holding crm_tools itself, which
+need not be the one holding the pages.
+"""
+
+import ast
+import os
+import sys
+
+# Directory holding the crm_tools package
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where PROPERTY_MAP has lived, newest first, relative to TOOLS_DIR
+PROPERTY_MAP_SOURCES = ('crm_tools/rewrite.py', 'fix_services.py')
+
+
+class GitError(Exception):
+    pass
+
+
+def git(args, cwd='.'):
+    """Run a git command and return its stdout as text"""
+    import subprocess
+
+    try:
+        proc = subprocess.run(['git', *args], cwd=cwd or '.', capture_output=True)
+    except OSError as e:
+        raise GitError(f'cannot run git: {e}')
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.decode('utf-8', 'replace').strip() or f'git {args[0]} failed')
+    return proc.stdout.decode('utf-8', 'surrogateescape')
+
+
+def _key(path):
+    return os.path.normcase(os.path.realpath(path))
+
+
+def add_since_argument(parser):
+    """Add the shared --since option to an argparse parser"""
+    parser.add_argument(
+        '--since', metavar='REV',
+        help='only process pages changed since this git revision (or affected by changed inputs)',
+    )
+
+
+def literal_in(source, name):
+    """Value of the top-level literal assignment `name = ...` in source, or None"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name for target in node.targets
+        ):
+            try:
+                return ast.literal_eval(node.value)
+            except ValueError:
+                return None
+    return None
+
+
+def _toplevel(cwd):
+    return git(['rev-parse', '--show-toplevel'], cwd).strip()
+
+
+class Changes:
+    """Files changed since `since`, relative to the repository containing `cwd`"""
+
+    def __init__(self, since, cwd='.'):
+        self.since = since
+        self.root = _toplevel(cwd)
+        try:
+            self.tools_root = _toplevel(TOOLS_DIR)
+        except GitError:
+            self.tools_root = None  # installed outside a checkout: no history to compare with
+        try:
+            git(['rev-parse', '--verify', '--quiet', f'{since}^{{commit}}'], self.root)
+        except GitError:
+            raise GitError(f'unknown revision {since!r}') from None
+
+        output = git(['diff-index', '--name-only', '-z', since], self.root)
+        output += git(['ls-files', '--others', '--exclude-standard', '-z'], self.root)
+        self.rel_paths = {path for path in output.split('\0') if path}
+        self.paths = {_key(os.path.join(self.root, path)) for path in self.rel_paths}
+
+    def touches(self, path):
+        return _key(path) in self.paths
+
+    def source_at(self, path):
+        """Text of a crm_tools file at `since`, or None if it did not exist"""
+        if self.tools_root is None:
+            return None
+        rel_path = os.path.relpath(os.path.realpath(path), self.tools_root).replace(os.sep, '/')
+        try:
+            return git(['show', f'{self.since}:{rel_path}'], self.tools_root)
+        except GitError:
+            return None
+
+    def literal_at(self, path, name):
+        """Value of `name` in the crm_tools file at `path` as of `since`, or None"""
+        source = self.source_at(path)
+        return None if source is None else literal_in(source, name)
+
+    def property_map_changed(self):
+        from crm_tools.rewrite import PROPERTY_MAP
+        for rel_path in PROPERTY_MAP_SOURCES:
+            old = self.literal_at(os.path.join(TOOLS_DIR, rel_path), 'PROPERTY_MAP')
+            if old is not None:
+                return old != PROPERTY_MAP
+        return True
+
+    def changed_keys(self, path, name, current):
+        """Keys of the dict `name` in `path` whose value differs from `current`"""
+        old = self.literal_at(path, name)
+        if not isinstance(old, dict):
+            return set(current)
+        return {key for key, value in current.items() if old.get(key) != value}
+
+
+def changes_for(parser, args, cwd='.'):
+    """Changes for args.since, or None; bad revisions end up in parser.error"""
+    if not args.since:
+        return None
+    if not os.path.isdir(cwd):
+        cwd = '.'
+    try:
+        return Changes(args.since, cwd)
+    except GitError as e:
+        parser.error(f'--since {args.since}: {e}')
+
+
+def filter_tasks(tasks, changes, uses_property_map=True, out=sys.stdout):
+    """Keep runner tasks `(func, path, *args)` whose page changed.
+
+    When the tasks rewrite PROPERTY_MAP keys and PROPERTY_MAP changed (or
+    its old value cannot be read), everything is kept, since any page
+    could contain one of its keys.
+    """
+    if changes is None:
+        return tasks
+    if uses_property_map and changes.property_map_changed():
+        print(f'[WARN] --since {changes.since}: PROPERTY_MAP changed or unreadable there, processing every page',
+              file=out)
+        return tasks
+    return [task for task in tasks if changes.touches(task[1])]
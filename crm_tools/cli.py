@@ -0,0 +1,70 @@
+"""
+One entry point for the fixers, generators and maintenance tools.
+
+    python -m crm_tools COMMAND [options]
+
+Only the chosen command's module is imported, so a command starts without
+loading the rest. Other tooling can call a command in-process with
+`run(command, argv)` instead of spawning a Python process per tenant.
+"""
+
+import importlib
+import sys
+
+# command -> (module with a main(argv), leading arguments, summary)
+COMMANDS = {
+    'fix-services': ('crm_tools.fix_services', [], 'rewrite snake_case property access in service pages'),
+    'fix-pages': ('crm_tools.fix_pages', [], 'replace ConfirmDialog triggers with plain delete buttons'),
+    'fix-actions': ('crm_tools.fix_actions', [], 'repair broken actions columns in list pages'),
+    'pipeline': ('crm_tools.pipeline', [], 'run every fixer stage over the services tree'),
+    'fanout': ('crm_tools.fanout', [], 'run the fixer stages across many tenant checkouts'),
+    'generate-services': ('crm_tools.generate_services_pages', [], 'generate the service module pages'),
+    'create-pages': ('crm_tools.create_all_pages', [], 'create the placeholder create/edit/details pages'),
+    'generate-payments': ('crm_tools.generate_payment_pages', [], 'generate the supplier payment pages'),
+    'validate': ('crm_tools.validate', [], 'check .tsx pages for unbalanced brackets, strings and JSX tags'),
+    'load-dump': ('crm_tools.load_dump', [], 'load a SQL backup into a local SQLite database'),
+    'dump-index': ('crm_tools.dump_index', [], 'index a SQL backup for per-table extract, count, sample and diff'),
+    'contracts': ('crm_tools.contracts', [], 'report page accessors that no backend handler produces'),
+    'rollback': ('crm_tools.atomic', ['rollback'], 'undo the last batch of writes under a directory'),
+    'schema': ('crm_tools.schema', [], 'derive PROPERTY_MAP and module fields from a schema dump'),
+    'cache': ('crm_tools.cache', [], 'clear the per-user crm_tools cache'),
+    'bench': ('crm_tools.bench', [], 'benchmark the fixers and generators'),
+}
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = ['usage: python -m crm_tools COMMAND [options]', '', 'commands:']
+    lines.extend(f'  {name:<{width}}  {summary}' for name, (_, _, summary) in COMMANDS.items())
+    lines.append('')
+    lines.append("Run 'python -m crm_tools COMMAND --help' for a command's options.")
+    return '\n'.join(lines)
+
+
+def run(command, argv=()):
+    """Run one command in this process and return its exit status"""
+    module_name, leading, _ = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    # argparse takes the program name shown in --help from sys.argv[0]
+    saved = sys.argv[0]
+    sys.argv[0] = f'python -m crm_tools {command}'
+    try:
+        status = module.main([*leading, *argv])
+    except SystemExit as e:
+        status = e.code
+    finally:
+        sys.argv[0] = saved
+    return status or 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f'python -m crm_tools: unknown command {command!r}\n', file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+    return run(command, rest)
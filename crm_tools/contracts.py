@@ -0,0 +1,449 @@
+"""
+Cross-layer field contracts: which fields the backend sends per API
+resource, and which ones the dashboard pages read.
+
+The backend reads snake_case rows and the frontend API client camelCases
+every response key, so a page accessor is only satisfied when the camelCase
+form of some emitted field equals it exactly. The index records:
+
+- per controller handler, the fields it emits: SELECT lists (`t.*` and
+  `RETURNING *` expanded from the newest dump's columns), object literal
+  keys and property assignments, plus those of helpers it calls;
+- from the routes file, which export serves `GET /api/<resource>`;
+- per page, the fields it reads: `accessorKey`s, `row.original.x` and
+  members of the records it destructures as `{ data: record }`.
+
+Everything lives in a SQLite file (`.field-contracts.sqlite`) and only
+files whose size or mtime changed are re-read, so a check after a small
+edit takes milliseconds. Accessors with no producer are reported, with the
+camelCase name to map to when the backend sends one.
+
+Usage:
+    python -m crm_tools.contracts [--root DIR] [--db FILE] [--module NAME ...] [--rebuild]
+"""
+
+import argparse
+import bisect
+import glob
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from crm_tools.schema import DUMP_GLOB, camel
+
+DB_NAME = '.field-contracts.sqlite'
+DB_VERSION = 1  # bump when extraction rules change, to re-read everything
+
+CONTROLLERS_GLOB = 'backend/src/controllers/*.js'
+ROUTES_GLOB = 'backend/src/routes/*.js'
+PAGES_DIR = 'frontend/src/app'
+
+# Dashboard folders that group pages rather than name a resource
+SECTIONS = {'services', 'payments', 'settings'}
+# Page module -> API resource, where the names differ
+RESOURCES = {'extras': 'extra-expenses', 'payables': 'supplier-payments', 'receivables': 'client-payments'}
+
+# An emitted '*' marks a handler whose fields cannot be known (e.g. no dump)
+UNKNOWN = '*'
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (path TEXT PRIMARY KEY, layer TEXT, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE emits (path TEXT, handler TEXT, field TEXT, line INTEGER);
+CREATE TABLE routes (path TEXT, resource TEXT, controller TEXT, handler TEXT);
+CREATE TABLE uses (path TEXT, module TEXT, field TEXT, line INTEGER);
+CREATE INDEX emits_handler ON emits (path, handler, field);
+CREATE INDEX routes_resource ON routes (resource);
+CREATE INDEX uses_module ON uses (module);
+"""
+
+_COMMENT_LINE = re.compile(r'^[ \t]*//[^\n]*', re.M)
+_DECLARATION = re.compile(r'^(?:exports\.(\w+)\s*=|(?:const|let|(?:async\s+)?function)\s+(\w+))', re.M)
+_IDENTIFIER = re.compile(r'\b[A-Za-z_$][\w$]*\b')
+_SELECT = re.compile(r'\bSELECT\s+(?:DISTINCT\s+)?', re.I)
+# Scanning a SELECT: parentheses, and the keywords that end its list and its FROM
+_SELECT_TOKEN = re.compile(r'[()`\'"]|\b(?:FROM|WHERE|GROUP|ORDER|LIMIT|HAVING|UNION|RETURNING)\b', re.I)
+_QUOTE_BEFORE = re.compile(r'([`\'"])\s*$')
+_TABLE_REF = re.compile(r'(?:\bFROM|\bJOIN|,)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|LEFT\b|RIGHT\b|INNER\b|JOIN\b|WHERE\b)(\w+))?', re.I)
+_RETURNING = re.compile(r'\b(?:INSERT\s+INTO|UPDATE)\s+(\w+)[^`]*?\bRETURNING\s+\*', re.S | re.I)
+_ALIAS = re.compile(r'(?:\bAS\s+|\s)"?(\w+)"?\s*$', re.I)
+_COLUMN = re.compile(r'^(?:(\w+)\.)?(\w+|\*)$')
+_OBJECT_KEY = re.compile(r'[{,]\s*(\w+)\s*(?::(?!:)|(?=[,}]))')
+_ASSIGNED = re.compile(r'\w\.(\w+)\s*=(?![=>])')
+_TABLE_ARGUMENT = re.compile(r"\(\s*'(\w+)'")
+
+_REQUIRE = re.compile(r"const\s+(\w+)\s*=\s*require\(\s*'([^']+)'\s*\)")
+_GET_ROUTE = re.compile(r"router\.get\(\s*'/api/([\w-]+)[^']*'.*?\b(\w+)\.(\w+)(?:\.\w+)?\s*\)\s*;", re.S)
+
+_ACCESSOR_KEY = re.compile(r"accessorKey:\s*['\"](\w+)['\"]")
+_ROW_FIELD = re.compile(r'\brow\.original\??\.(\w+)\b(?!\s*\()')
+_RECORD = re.compile(r'const\s*\{[^}]*\bdata:\s*(\w+)')
+_RECORD_ALIAS = re.compile(r'const\s+(\w+)\s*=\s*(\w+)\s*;')
+
+
+class Lines:
+    """Offset -> 1-based line number"""
+
+    def __init__(self, text):
+        self.starts = [m.end() for m in re.finditer('\n', text)]
+
+    def __call__(self, offset):
+        return bisect.bisect_right(self.starts, offset) + 1
+
+
+def _split_select(text):
+    """Top-level comma-separated items of a SELECT list"""
+    items, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            items.append(text[start:i].strip())
+            start = i + 1
+    items.append(text[start:].strip())
+    return [item for item in items if item]
+
+
+def select_fields(select, tables, catalogue):
+    """Field names a SELECT list produces; `tables` maps alias -> table"""
+    fields = []
+    for item in _split_select(select):
+        match = _COLUMN.match(item)
+        if match:
+            alias, column = match.groups()
+            if column != '*':
+                fields.append(column)
+                continue
+            if alias and alias not in tables:
+                continue  # a fragment without its FROM, e.g. a query.replace() pattern
+            names = [tables[alias]] if alias else list(dict.fromkeys(tables.values()))
+            for name in names:
+                fields.extend(catalogue.get(name, [UNKNOWN]))
+            continue
+        match = _ALIAS.search(item)
+        if match:
+            fields.append(match.group(1))
+    return fields
+
+
+def _select_parts(text, start, quote='`'):
+    """(select list, from clause) of the SELECT whose list starts at text[start].
+
+    `quote` is the JS string delimiter around the SQL; other quotes are SQL literals.
+    """
+    depth = 0
+    list_end = from_start = None
+    for token in _SELECT_TOKEN.finditer(text, start):
+        word = token.group().upper()
+        if word in '`\'"' and word != quote:
+            continue
+        if word == '(':
+            depth += 1
+            continue
+        if word == ')':
+            depth -= 1
+            if depth >= 0:
+                continue
+        elif depth > 0:
+            continue
+        if word == 'FROM' and list_end is None:
+            list_end, from_start = token.start(), token.end()
+            continue
+        end = token.start()
+        break
+    else:
+        end = len(text)
+    if list_end is None:
+        return text[start:end], ''
+    return text[start:list_end], text[from_start:end]
+
+
+def _sql_fields(text, catalogue):
+    """(offset, field) for every field the SQL in `text` returns"""
+    found = []
+    for match in _SELECT.finditer(text):
+        before = _QUOTE_BEFORE.search(text, max(0, match.start() - 40), match.start())
+        select, from_clause = _select_parts(text, match.end(), before.group(1) if before else '`')
+        tables = {}
+        for ref in _TABLE_REF.finditer(' FROM ' + from_clause):
+            table, alias = ref.groups()
+            tables[alias or table] = table
+        for field in select_fields(select, tables, catalogue):
+            found.append((match.start(), field))
+    for match in _RETURNING.finditer(text):
+        for field in catalogue.get(match.group(1), [UNKNOWN]):
+            found.append((match.start(), field))
+    return found
+
+
+def _js_fields(text):
+    """(offset, field) for object literal keys and property assignments"""
+    found = [(m.start(1), m.group(1)) for m in _OBJECT_KEY.finditer(text)]
+    found.extend((m.start(1), m.group(1)) for m in _ASSIGNED.finditer(text))
+    return found
+
+
+def controller_emits(text, catalogue):
+    """(handler, field, line) for every top-level declaration of a controller.
+
+    Handlers are `exports.x = ...` and `const x = ...` / `function x` alike,
+    since some controllers export through `module.exports = {...}`. Fields
+    are camelCased, as the frontend client sees them, and a handler also
+    emits the fields of the top-level helpers it mentions by name.
+    """
+    text = _COMMENT_LINE.sub('', text)
+    line_of = Lines(text)
+    starts = list(_DECLARATION.finditer(text))
+
+    chunks = {}
+    for i, match in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(text)
+        body = text[match.start():end]
+        fields = [(match.start() + offset, field) for offset, field in _sql_fields(body, catalogue) + _js_fields(body)]
+        # exports.x = createCRUDHandlers('table'): the table's columns
+        argument = _TABLE_ARGUMENT.search(body.split('\n', 1)[0])
+        if argument and argument.group(1) in catalogue:
+            fields.extend((match.start(), column) for column in catalogue[argument.group(1)])
+        name = match.group(1) or match.group(2)
+        chunks.setdefault(name, ([], set()))
+        chunks[name][0].extend(fields)
+        chunks[name][1].update(_IDENTIFIER.findall(body))
+
+    emits = []
+    for name, (fields, mentioned) in chunks.items():
+        for helper in mentioned & chunks.keys() - {name}:
+            fields = fields + chunks[helper][0]
+        for offset, field in fields:
+            emits.append((name, field if field == UNKNOWN else camel(field), line_of(offset)))
+    return emits
+
+
+def route_handlers(text, routes_dir):
+    """(resource, controller path, export) for every GET /api route"""
+    controllers = {
+        name: os.path.normpath(os.path.join(routes_dir, target)) + '.js'
+        for name, target in _REQUIRE.findall(text)
+        if 'controllers' in target
+    }
+    routes = []
+    for resource, variable, export in _GET_ROUTE.findall(_COMMENT_LINE.sub('', text)):
+        if variable in controllers:
+            routes.append((resource, controllers[variable], export))
+    return routes
+
+
+def page_module(path):
+    """The API resource a dashboard page reads, from its folder"""
+    parts = path.replace(os.sep, '/').split('/')
+    if 'dashboard' not in parts:
+        return None
+    parts = [part for part in parts[parts.index('dashboard') + 1:-1] if not part.startswith('[')]
+    if parts and parts[0] in SECTIONS:
+        parts = parts[1:]
+    if not parts:
+        return None
+    return RESOURCES.get(parts[0], parts[0])
+
+
+def page_uses(text):
+    """(field, line) for every record field a page reads"""
+    line_of = Lines(text)
+    uses = [(m.group(1), line_of(m.start())) for m in _ACCESSOR_KEY.finditer(text)]
+    uses.extend((m.group(1), line_of(m.start())) for m in _ROW_FIELD.finditer(text))
+    records = set(_RECORD.findall(text))
+    for alias, source in _RECORD_ALIAS.findall(text):
+        if source in records:
+            records.add(alias)
+    if records:
+        member = re.compile(rf"(?<![\w@.$-])(?:{'|'.join(sorted(records))})\??\.(\w+)\b(?!\s*\()")
+        uses.extend((m.group(1), line_of(m.start())) for m in member.finditer(text))
+    return uses
+
+
+class ContractIndex:
+    """The persistent index over one checkout"""
+
+    def __init__(self, root='.', db_path=None):
+        self.root = root
+        self.db_path = db_path or os.path.join(root, DB_NAME)
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != DB_VERSION:
+            self.reset()
+        self._catalogue = None
+        self.reindexed = 0
+
+    def reset(self):
+        for (name,) in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            self.conn.execute(f'DROP TABLE {name}')
+        self.conn.executescript(_SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {DB_VERSION}')
+
+    def close(self):
+        self.conn.close()
+
+    def _dump(self):
+        dumps = sorted(glob.glob(os.path.join(self.root, DUMP_GLOB)))
+        return dumps[-1] if dumps else None
+
+    def catalogue(self):
+        """Table -> columns of the newest dump (read through its sidecar index)"""
+        if self._catalogue is None:
+            from crm_tools.dump_index import load_index
+
+            dump = self._dump()
+            self._catalogue = {entry.name: entry.columns for entry in load_index(dump)} if dump else {}
+        return self._catalogue
+
+    def _files(self):
+        files = {}
+        for pattern, layer in ((CONTROLLERS_GLOB, 'controller'), (ROUTES_GLOB, 'routes')):
+            for path in glob.glob(os.path.join(self.root, pattern)):
+                files[os.path.normpath(path)] = layer
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, PAGES_DIR)):
+            if 'page.tsx' in filenames:
+                files[os.path.normpath(os.path.join(dirpath, 'page.tsx'))] = 'page'
+        return files
+
+    def update(self):
+        """Re-read every file added, changed or removed since the last run"""
+        conn = self.conn
+        known = {path: (layer, size, mtime) for path, layer, size, mtime in conn.execute('SELECT * FROM files')}
+        dump = self._dump()
+        dump_stamp = None
+        if dump:
+            st = os.stat(dump)
+            dump_stamp = f'{os.path.basename(dump)}:{st.st_size}:{st.st_mtime_ns}'
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dump'").fetchone()
+        # Controllers expand `*` from the dump, so a new dump re-reads them
+        dump_changed = (row[0] if row else None) != dump_stamp
+
+        conn.execute('BEGIN')
+        try:
+            files = self._files()
+            for path in known.keys() - files.keys():
+                self._forget(path)
+            for path, layer in files.items():
+                st = os.stat(path)
+                stamp = (layer, st.st_size, st.st_mtime_ns)
+                if known.get(path) == stamp and not (dump_changed and layer == 'controller'):
+                    continue
+                self._forget(path)
+                self._read(path, layer)
+                conn.execute('INSERT INTO files VALUES (?, ?, ?, ?)', (path,) + stamp)
+                self.reindexed += 1
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('dump', ?)", (dump_stamp,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _forget(self, path):
+        for table in ('files', 'emits', 'routes', 'uses'):
+            self.conn.execute(f'DELETE FROM {table} WHERE path = ?', (path,))
+
+    def _read(self, path, layer):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if layer == 'controller':
+            self.conn.executemany(
+                'INSERT INTO emits VALUES (?, ?, ?, ?)',
+                [(path, handler, field, line) for handler, field, line in controller_emits(text, self.catalogue())],
+            )
+        elif layer == 'routes':
+            self.conn.executemany(
+                'INSERT INTO routes VALUES (?, ?, ?, ?)',
+                [(path,) + route for route in route_handlers(text, os.path.dirname(path))],
+            )
+        else:
+            module = page_module(path)
+            if module:
+                self.conn.executemany(
+                    'INSERT INTO uses VALUES (?, ?, ?, ?)',
+                    [(path, module, field, line) for field, line in page_uses(text)],
+                )
+
+    def missing(self, modules=None):
+        """(path, line, module, field, suggestion) for every read field with no producer.
+
+        Only modules served by a GET route whose handlers' fields are all
+        known are checked. `suggestion` is the camelCase name when the
+        backend sends that instead, else None.
+        """
+        query = """
+            SELECT DISTINCT u.path, u.line, u.module, u.field FROM uses u
+            WHERE u.module IN (SELECT resource FROM routes)
+              AND NOT EXISTS (
+                SELECT 1 FROM routes r JOIN emits e ON e.path = r.controller AND e.handler = r.handler
+                WHERE r.resource = u.module AND e.field = ?)
+              AND NOT EXISTS (
+                SELECT 1 FROM routes r JOIN emits e ON e.path = r.controller AND e.handler = r.handler
+                WHERE r.resource = u.module AND e.field = u.field)
+            ORDER BY u.path, u.line
+        """
+        found = []
+        for path, line, module, field in self.conn.execute(query, (UNKNOWN,)):
+            if modules and module not in modules:
+                continue
+            suggestion = camel(field)
+            if suggestion == field or not self.produces(module, suggestion):
+                suggestion = None
+            found.append((path, line, module, field, suggestion))
+        return found
+
+    def produces(self, module, field):
+        return self.conn.execute(
+            'SELECT 1 FROM routes r JOIN emits e ON e.path = r.controller AND e.handler = r.handler '
+            'WHERE r.resource = ? AND e.field = ? LIMIT 1',
+            (module, field),
+        ).fetchone() is not None
+
+    def unchecked(self):
+        """Page modules not checked: no GET route, or a handler with unknown fields"""
+        return [module for (module,) in self.conn.execute("""
+            SELECT DISTINCT module FROM uses
+            WHERE module NOT IN (SELECT resource FROM routes)
+               OR module IN (SELECT r.resource FROM routes r JOIN emits e
+                             ON e.path = r.controller AND e.handler = r.handler WHERE e.field = ?)
+            ORDER BY module
+        """, (UNKNOWN,))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report page accessors that no backend handler produces')
+    parser.add_argument('--root', default='.', help='checkout to analyse (default: current directory)')
+    parser.add_argument('--db', help=f'index file (default: ROOT/{DB_NAME})')
+    parser.add_argument('--module', action='append', dest='modules', metavar='NAME',
+                        help='only report this API resource (repeatable)')
+    parser.add_argument('--rebuild', action='store_true', help='drop the index and re-read every file')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = ContractIndex(args.root, args.db)
+    try:
+        if args.rebuild:
+            index.reset()
+        index.update()
+        missing = index.missing(args.modules)
+        unchecked = index.unchecked()
+    finally:
+        index.close()
+    ms = (time.perf_counter() - start) * 1000
+
+    for path, line, module, field, suggestion in missing:
+        hint = f" (backend sends '{suggestion}': PROPERTY_MAP['{field}'] = '{suggestion}')" if suggestion else ''
+        print(f'[MISSING] {os.path.relpath(path, args.root)}:{line} {module}.{field}{hint}')
+    if unchecked:
+        print(f'[SKIP] not checked: {", ".join(unchecked)}')
+    pages = len({path for path, *_ in missing})
+    print(f'[DONE] {len(missing)} accessors without a producer in {pages} pages '
+          f'({index.reindexed} files re-read, {ms:.0f} ms)')
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
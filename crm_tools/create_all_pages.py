@@ -0,0 +1,33 @@
+"""
+Create placeholder create/edit/details pages for the service modules.
+
+The placeholders are now rendered by generate_services_pages in the same
+streaming pass as the list pages; this command only limits that pass to the
+three placeholder kinds.
+"""
+
+import argparse
+import sys
+
+from crm_tools.generate_services_pages import generate
+
+BASE = r'C:\Users\fatih\Desktop\CRM\frontend\src\app\(dashboard)\dashboard\services'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create the placeholder create/edit/details pages')
+    parser.add_argument('--base-path', default=BASE, help='services directory to write pages into')
+    args = parser.parse_args(argv)
+
+    kept = []
+    written, skipped = generate(args.base_path, kinds=['create', 'edit', 'details'], kept=kept)
+    for rel_path in kept:
+        print(f'[KEEP] {rel_path} is a real page, not overwritten')
+    for rel_path, meta in written:
+        print(f'[OK] Created {rel_path}')
+    print('[DONE] All placeholder pages created!')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
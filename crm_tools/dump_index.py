@@ -0,0 +1,315 @@
+"""
+Sidecar byte-offset index for SQL backups.
+
+One sequential pass over a dump records, per `-- Table:` section, its byte
+range, the range of its INSERT lines, its row count (the `-- Total rows:`
+marker, else the INSERTs counted) and its columns. The index is saved as
+JSON next to the dump (`<dump>.idx`) and rebuilt whenever the dump's size
+or mtime no longer match.
+
+Lookups then mmap the dump and slice straight to the table:
+
+    python -m crm_tools.dump_index index [--dump FILE]
+    python -m crm_tools.dump_index count [--dump FILE] [TABLE ...]
+    python -m crm_tools.dump_index extract [--dump FILE] [-o OUT] TABLE ...
+    python -m crm_tools.dump_index sample [--dump FILE] [-n 5] [--seed N] TABLE
+    python -m crm_tools.dump_index diff OLD NEW [TABLE ...]
+
+TABLE arguments accept shell wildcards.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+
+from crm_tools.schema import DUMP_GLOB, _split_columns, latest_dump
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+# start/end: the whole section, banner included; data_*: its INSERT lines
+Entry = namedtuple('Entry', ['name', 'columns', 'rows', 'start', 'end', 'data_start', 'data_end'])
+
+_ROW_START = b'\nINSERT INTO '
+
+
+def index_path(dump):
+    return dump + INDEX_SUFFIX
+
+
+def build_index(dump):
+    """Scan `dump` once; returns its Entries in file order"""
+    entries = []
+    current = None
+    banner = None  # offset of a `-- ===` line that may open the next section
+    offset = 0
+
+    def finish():
+        rows = current['inserts'] if current['rows'] is None else current['rows']
+        data_start = current['data_start']
+        if data_start is None:
+            data_start = current['data_end'] = current['end']
+        entries.append(Entry(
+            current['name'], current['columns'], rows,
+            current['start'], current['end'], data_start, current['data_end'],
+        ))
+
+    with open(dump, 'rb') as f:
+        for line in f:
+            after = offset + len(line)
+            if line.startswith(b'-- '):
+                if line.startswith(b'-- ==='):
+                    if banner is None:
+                        banner = offset
+                elif line.startswith(b'-- Table: '):
+                    if current is not None:
+                        finish()
+                    current = {
+                        'name': line[10:].decode('utf-8').strip(), 'columns': [], 'rows': None,
+                        'inserts': 0, 'start': offset if banner is None else banner, 'end': after,
+                        'data_start': None, 'data_end': None,
+                    }
+                    banner = None
+                elif current is not None:
+                    if line.startswith(b'-- Columns: '):
+                        current['columns'] = _split_columns(line[12:].decode('utf-8'))
+                    elif line.startswith(b'-- Total rows: '):
+                        current['rows'] = int(line[15:].strip() or 0)
+                    elif not line.startswith(b'-- No data'):
+                        offset = after
+                        continue  # a footer comment, not part of the section
+                    current['end'] = after
+                    banner = None
+            elif current is not None and line.strip():
+                # An INSERT, or the continuation of a value spanning lines
+                if line.startswith(b'INSERT INTO '):
+                    current['inserts'] += 1
+                    if current['data_start'] is None:
+                        current['data_start'] = offset
+                current['end'] = current['data_end'] = after
+                banner = None
+            offset = after
+    if current is not None:
+        finish()
+    return entries
+
+
+def _stamp(dump):
+    st = os.stat(dump)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def load_index(dump, rebuild=False):
+    """Entries for `dump`, from its sidecar when it is current, else rebuilt and saved"""
+    path = index_path(dump)
+    stamp = _stamp(dump)
+    if not rebuild:
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('version') == INDEX_VERSION and saved.get('dump') == stamp:
+                return [Entry(*entry) for entry in saved['tables']]
+        except (OSError, ValueError, TypeError):
+            pass
+    entries = build_index(dump)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'dump': stamp, 'tables': entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # a read-only dump directory only costs a rescan next time
+    return entries
+
+
+@contextmanager
+def mapped(dump):
+    """The dump as a read-only mmap (bytes for an empty file)"""
+    with open(dump, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            yield m
+
+
+def matching(entries, patterns):
+    """Entries whose name matches any of `patterns` (all for none)"""
+    from crm_tools.load_dump import selected
+
+    return [entry for entry in entries if selected(entry.name, patterns)]
+
+
+def sample_rows(data, entry, n, seed=None):
+    """Up to `n` INSERT statements of the table, picked at random, in file order.
+
+    Seeks to random offsets and takes the statement that starts there or next,
+    so long rows are a little likelier to be picked; the table is never scanned.
+    """
+    start, end = entry.data_start, entry.data_end
+    if start >= end:
+        return []
+    rng = random.Random(seed)
+    picked = {}
+    for _ in range(n * 4):
+        if len(picked) >= n:
+            break
+        pos = rng.randrange(start, end)
+        if pos != start:
+            pos = data.find(_ROW_START, pos - 1, end)
+            pos = end if pos == -1 else pos + 1
+        if pos == end:
+            pos = data.rfind(_ROW_START, start, end - 1)
+            pos = start if pos == -1 else pos + 1
+        if pos not in picked:
+            stop = data.find(_ROW_START, pos, end)
+            picked[pos] = bytes(data[pos:end if stop == -1 else stop + 1])
+    return [picked[pos] for pos in sorted(picked)]
+
+
+def diff_table(old_data, old, new_data, new):
+    """(rows only in old, rows only in new) of one table, comparing whole statements"""
+    a = old_data[old.data_start:old.data_end]
+    b = new_data[new.data_start:new.data_end]
+    if a == b:
+        return 0, 0
+
+    def statements(data):
+        # Leading newline so the first statement splits like the others
+        return Counter(hash(row) for row in (b'\n' + data.rstrip(b'\n')).split(_ROW_START)[1:])
+
+    old_rows, new_rows = statements(a), statements(b)
+    return sum((old_rows - new_rows).values()), sum((new_rows - old_rows).values())
+
+
+def _dump_argument(parser):
+    parser.add_argument('--dump', help=f'SQL backup to read (default: newest {DUMP_GLOB})')
+
+
+def _resolve_dump(parser, args):
+    dump = args.dump or latest_dump()
+    if dump is None:
+        parser.error(f'no dump found matching {DUMP_GLOB}')
+    return dump
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Random access into SQL backups through a sidecar index')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('index', help='build or refresh the index')
+    _dump_argument(p)
+    p.add_argument('--force', action='store_true', help='rebuild even if the index is current')
+
+    p = commands.add_parser('count', help='row counts per table')
+    _dump_argument(p)
+    p.add_argument('tables', nargs='*', metavar='TABLE')
+
+    p = commands.add_parser('extract', help='write table sections out as SQL')
+    _dump_argument(p)
+    p.add_argument('-o', '--output', help='file to write (default: stdout)')
+    p.add_argument('--data-only', action='store_true', help='only the INSERT statements')
+    p.add_argument('tables', nargs='+', metavar='TABLE')
+
+    p = commands.add_parser('sample', help='print a few random rows of a table')
+    _dump_argument(p)
+    p.add_argument('-n', type=int, default=5, help='rows to print (default: 5)')
+    p.add_argument('--seed', type=int, help='random seed, for repeatable samples')
+    p.add_argument('table', metavar='TABLE')
+
+    p = commands.add_parser('diff', help='compare two dumps table by table')
+    p.add_argument('old')
+    p.add_argument('new')
+    p.add_argument('tables', nargs='*', metavar='TABLE')
+    args = parser.parse_args(argv)
+
+    if args.command == 'diff':
+        return _diff(args.old, args.new, args.tables)
+
+    dump = _resolve_dump(parser, args)
+    if args.command == 'index':
+        start = time.perf_counter()
+        entries = load_index(dump, rebuild=args.force)
+        seconds = time.perf_counter() - start
+        print(f'[DONE] {len(entries)} tables, {sum(e.rows for e in entries)} rows in {seconds:.2f}s -> {index_path(dump)}')
+        return 0
+
+    patterns = [args.table] if args.command == 'sample' else args.tables
+    entries = matching(load_index(dump), patterns)
+    if not entries:
+        print(f'[ERROR] no table matches in {dump}')
+        return 1
+
+    if args.command == 'count':
+        width = max(len(entry.name) for entry in entries)
+        for entry in entries:
+            print(f'{entry.name:<{width}}  {entry.rows}')
+        if len(entries) > 1:
+            print(f'{"total":<{width}}  {sum(entry.rows for entry in entries)}')
+        return 0
+
+    with mapped(dump) as data:
+        if args.command == 'sample':
+            for entry in entries:
+                for row in sample_rows(data, entry, args.n, args.seed):
+                    sys.stdout.buffer.write(row)
+            sys.stdout.flush()
+            return 0
+
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        try:
+            for entry in entries:
+                if args.data_only:
+                    out.write(data[entry.data_start:entry.data_end])
+                else:
+                    out.write(data[entry.start:entry.end] + b'\n')
+        finally:
+            if args.output:
+                out.close()
+            else:
+                out.flush()
+    if args.output:
+        print(f'[DONE] {len(entries)} tables, {sum(e.rows for e in entries)} rows -> {args.output}')
+    return 0
+
+
+def _diff(old_dump, new_dump, patterns):
+    old_entries = {entry.name: entry for entry in matching(load_index(old_dump), patterns)}
+    new_entries = {entry.name: entry for entry in matching(load_index(new_dump), patterns)}
+    counts = Counter()
+    with mapped(old_dump) as old_data, mapped(new_dump) as new_data:
+        for name in sorted(old_entries.keys() | new_entries.keys()):
+            old, new = old_entries.get(name), new_entries.get(name)
+            if old is None:
+                print(f'[ADDED] {name}: {new.rows} rows')
+                counts['added'] += 1
+                continue
+            if new is None:
+                print(f'[REMOVED] {name}: {old.rows} rows')
+                counts['removed'] += 1
+                continue
+            if old.columns != new.columns:
+                gone = [c for c in old.columns if c not in new.columns]
+                came = [c for c in new.columns if c not in old.columns]
+                print(f'[COLUMNS] {name}: -{", ".join(gone) or "(none)"} +{", ".join(came) or "(none)"}')
+            removed, added = diff_table(old_data, old, new_data, new)
+            if removed or added:
+                print(f'[CHANGED] {name}: -{removed} +{added} rows ({old.rows} -> {new.rows})')
+                counts['changed'] += 1
+            else:
+                counts['same'] += 1
+    print(
+        f'[DONE] {counts["same"]} same, {counts["changed"]} changed, '
+        f'{counts["added"]} added, {counts["removed"]} removed'
+    )
+    return 1 if counts['changed'] or counts['added'] or counts['removed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
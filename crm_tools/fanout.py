@@ -0,0 +1,192 @@
+"""
+Run the page codemods across many tenant checkouts at once.
+
+Every checkout root contributes the service pages under its own
+`DEFAULT_BASE_PATH`. Pages are hashed by content (together with their page
+kind), and each distinct input is transformed once in the worker pool; the
+result is reused for every tenant that has the same file. Writes go through
+one journaled batch per checkout (see crm_tools.atomic), and the run ends
+with a single report covering all tenants.
+
+Usage:
+    python -m crm_tools.fanout ROOT [ROOT ...] [--roots-file FILE]
+                               [--stage NAME] [--jobs N] [--report FILE]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import namedtuple
+
+from crm_tools.atomic import Batch
+from crm_tools.pipeline import DEFAULT_BASE_PATH, apply_stages, discover_pages
+from crm_tools.runner import add_jobs_argument, resolve_jobs
+from crm_tools.stages import STAGES
+from crm_tools.validate import add_validate_argument, introduces_problems
+
+# One distinct (kind, content) input and the result of transforming it
+WorkItem = namedtuple('WorkItem', ['key', 'kind', 'content'])
+Outcome = namedtuple('Outcome', ['key', 'content', 'changed', 'error'])
+
+
+def input_key(data, kind):
+    return hashlib.blake2b(kind.encode('ascii') + b'\0' + data, digest_size=16).hexdigest()
+
+
+def transform_item(item, names=None, validate=True):
+    """Apply the stage chain to one distinct input; runs in a worker"""
+    try:
+        content, changed = apply_stages(item.content, item.kind, names)
+    except Exception as e:
+        return Outcome(item.key, None, [], f'{type(e).__name__}: {e}')
+    if not changed:
+        return Outcome(item.key, None, [], None)
+    if validate and introduces_problems(item.content, content):
+        return Outcome(item.key, None, [], f'rewrite would add syntax problems ({", ".join(changed)}), not written')
+    return Outcome(item.key, content, changed, None)
+
+
+def _transform_all(items, names, jobs, validate=True):
+    jobs = min(resolve_jobs(jobs), len(items)) if items else 1
+    if jobs <= 1:
+        return [transform_item(item, names, validate) for item in items]
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(
+            transform_item, items, [names] * len(items), [validate] * len(items), chunksize=chunksize,
+        ))
+
+
+def collect(roots):
+    """Read every tenant page once; returns (pages, items, failures).
+
+    `pages` lists (root, path, key) per file, `items` the distinct inputs and
+    `failures` (root, path, error) for files that could not be read.
+    """
+    pages = []
+    items = {}
+    failures = []
+    for root in roots:
+        base_path = os.path.join(root, DEFAULT_BASE_PATH)
+        if not os.path.isdir(base_path):
+            continue
+        for path, kind in discover_pages(base_path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                failures.append((root, path, f'{type(e).__name__}: {e}'))
+                continue
+            key = input_key(content.encode('utf-8'), kind)
+            pages.append((root, path, key))
+            if key not in items:
+                items[key] = WorkItem(key, kind, content)
+    return pages, list(items.values()), failures
+
+
+def fan_out(roots, names=None, jobs=1, validate=True):
+    """Fix every tenant and return the consolidated report as a dict"""
+    pages, items, failures = collect(roots)
+    outcomes = {outcome.key: outcome for outcome in _transform_all(items, names, jobs, validate)}
+
+    tenants = {root: {'fixed': 0, 'unchanged': 0, 'errors': 0, 'files': []} for root in roots}
+    for root, path, error in failures:
+        tenants[root]['errors'] += 1
+        tenants[root]['files'].append({'path': path, 'status': 'error', 'error': error})
+    batches = {}
+    for root, path, key in pages:
+        outcome = outcomes[key]
+        tenant = tenants[root]
+        if outcome.error:
+            tenant['errors'] += 1
+            tenant['files'].append({'path': path, 'status': 'error', 'error': outcome.error})
+            continue
+        if outcome.content is None:
+            tenant['unchanged'] += 1
+            continue
+        batch = batches.get(root)
+        if batch is None:
+            batch = batches[root] = Batch(os.path.join(root, DEFAULT_BASE_PATH))
+        if batch.write(path, outcome.content):
+            tenant['fixed'] += 1
+            tenant['files'].append({'path': path, 'status': 'fixed', 'stages': outcome.changed})
+        else:
+            tenant['unchanged'] += 1
+    try:
+        for batch in batches.values():
+            batch.commit()
+    except BaseException:
+        for batch in batches.values():
+            batch.abort()
+        raise
+
+    missing = [root for root in roots if not os.path.isdir(os.path.join(root, DEFAULT_BASE_PATH))]
+    return {
+        'tenants': tenants,
+        'missing': missing,
+        'files': len(pages),
+        'unique_inputs': len(items),
+        'transforms_changed': sum(1 for outcome in outcomes.values() if outcome.content is not None),
+    }
+
+
+def print_report(report):
+    for root, tenant in report['tenants'].items():
+        if root in report['missing']:
+            print(f'[SKIP] {root}: no {DEFAULT_BASE_PATH}')
+            continue
+        for entry in tenant['files']:
+            if entry['status'] == 'error':
+                print(f'[ERROR] {entry["path"]}: {entry["error"]}')
+            else:
+                print(f'[OK] {entry["path"]} ({", ".join(entry["stages"])})')
+        print(f'{root}: {tenant["fixed"]} fixed, {tenant["unchanged"]} unchanged, {tenant["errors"]} errors')
+
+    files, unique = report['files'], report['unique_inputs']
+    shared = f' ({files / unique:.1f}x shared)' if unique else ''
+    fixed = sum(tenant['fixed'] for tenant in report['tenants'].values())
+    errors = sum(tenant['errors'] for tenant in report['tenants'].values())
+    print(
+        f'[DONE] {len(report["tenants"])} checkouts, {files} pages, {unique} distinct inputs{shared}, '
+        f'{fixed} fixed, {errors} errors'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the page codemods across many checkouts')
+    parser.add_argument('roots', nargs='*', metavar='ROOT', help='checkout root of a tenant fork')
+    parser.add_argument('--roots-file', help='file with one checkout root per line')
+    parser.add_argument(
+        '--stage', action='append', dest='stages', choices=sorted({s.name for s in STAGES}),
+        help='only run this stage (repeatable, default: all)',
+    )
+    parser.add_argument('--report', metavar='FILE', help='also write the consolidated report as JSON')
+    add_jobs_argument(parser)
+    add_validate_argument(parser)
+    args = parser.parse_args(argv)
+
+    roots = list(args.roots)
+    if args.roots_file:
+        with open(args.roots_file, 'r', encoding='utf-8') as f:
+            roots.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    if not roots:
+        parser.error('give at least one checkout root')
+    roots = list(dict.fromkeys(os.path.abspath(root) for root in roots))
+
+    report = fan_out(roots, tuple(args.stages) if args.stages else None, args.jobs, args.validate)
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f'[OK] Report written to {args.report}')
+    errors = sum(tenant['errors'] for tenant in report['tenants'].values())
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
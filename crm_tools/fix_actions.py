@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+
+from crm_tools.atomic import commit_results, stage
+from crm_tools.changes import add_since_argument, changes_for, filter_tasks
+from crm_tools.prefilter import Prefilter, add_prefilter_argument, partition
+from crm_tools.preview import add_diff_argument, run_or_preview, status_stream
+from crm_tools.profiling import add_profile_arguments, finish as finish_profile, report_for
+from crm_tools.runner import (
+    FIXED, SKIPPED, FileResult, add_budget_argument, add_jobs_argument, count_errors,
+)
+from crm_tools.stages import tokens_for
+from crm_tools.transforms import find_actions_column, needs_actions_repair, repair_actions_column
+from crm_tools.validate import add_validate_argument, validate_results
+
+BASE = r'C:\Users\fatih\Desktop\CRM\frontend\src\app\(dashboard)\dashboard\services'
+modules = ['guides', 'restaurants', 'suppliers', 'tour-companies', 'transfer-routes', 'vehicle-companies', 'vehicle-rentals', 'vehicle-types']
+
+
+def fix_actions(file_path, module):
+    if not os.path.exists(file_path):
+        return FileResult(file_path, SKIPPED, '')
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    if not needs_actions_repair(content):
+        return FileResult(file_path, SKIPPED, f'[SKIP] {module} already fixed')
+    if find_actions_column(content) is None:
+        return FileResult(file_path, SKIPPED, f'[SKIP] No actions column found in {module}')
+
+    content = repair_actions_column(content)
+    return FileResult(file_path, FIXED, f'[OK] Fixed {module}', stage(file_path, content))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Repair the broken delete button in list page actions columns')
+    parser.add_argument('--base-path', default=BASE, help='services directory to fix')
+    add_jobs_argument(parser)
+    add_budget_argument(parser)
+    add_profile_arguments(parser)
+    add_prefilter_argument(parser)
+    add_since_argument(parser)
+    add_validate_argument(parser)
+    add_diff_argument(parser)
+    args = parser.parse_args(argv)
+    out = status_stream(args)
+    changes = changes_for(parser, args, args.base_path)
+
+    tasks = [(fix_actions, os.path.join(args.base_path, module, 'page.tsx'), module) for module in modules]
+    selected = filter_tasks(tasks, changes, uses_property_map=False, out=out)
+    rejected = []
+    if args.prefilter:
+        prefilter = Prefilter(tokens_for('list', ['actions-column']), args.base_path)
+        selected, rejected = partition(selected, lambda task: prefilter)
+
+    profile = report_for(args)
+    done = dict(zip(selected, run_or_preview(selected, args, profile)))
+    for task in rejected:
+        done[task] = FileResult(task[1], SKIPPED, f'[SKIP] {task[2]} already fixed')
+    results = [done.get(task) or FileResult(task[1], SKIPPED, '') for task in tasks]
+    if args.validate:
+        results = validate_results(results, args.jobs)
+    commit_results(results, args.base_path)
+    for result in results:
+        if result.message:
+            print(result.message, file=out)
+
+    print('[DONE]', file=out)
+    finish_profile(profile, args)
+    return 1 if count_errors(results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
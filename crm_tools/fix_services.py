@@ -0,0 +1,143 @@
+import argparse
+import os
+import sys
+
+from crm_tools import profiling
+from crm_tools.atomic import commit_results, stage, stage_stream
+from crm_tools.changes import add_since_argument, changes_for, filter_tasks
+from crm_tools.prefilter import Prefilter, add_prefilter_argument, partition
+from crm_tools.preview import add_diff_argument, run_or_preview, status_stream
+from crm_tools.profiling import add_profile_arguments, finish as finish_profile, report_for
+from crm_tools.rewrite import STREAM_THRESHOLD, NeedsWholeFile
+from crm_tools.runner import FIXED, SKIPPED, FileResult, add_jobs_argument, count_errors
+from crm_tools.stages import tokens_for
+from crm_tools.transforms import (
+    fix_edit_content, fix_list_content, fix_view_content, stream_list_file, stream_view_file,
+)
+from crm_tools.validate import add_validate_argument, validate_results
+
+# Define all service modules to fix
+modules = [
+    'entrance-fees', 'extras', 'guides', 'hotels', 'restaurants', 'suppliers',
+    'tour-companies', 'transfer-routes', 'vehicle-companies', 'vehicle-rentals', 'vehicle-types'
+]
+
+base_path = 'frontend/src/app/(dashboard)/dashboard/services'
+
+def streams(filepath):
+    # Huge pages are rewritten chunk by chunk; --profile times the whole-file path
+    return os.path.getsize(filepath) >= STREAM_THRESHOLD and not profiling.enabled()
+
+def fix_view_page(filepath):
+    if not os.path.exists(filepath):
+        return FileResult(filepath, SKIPPED, '')
+
+    if streams(filepath):
+        try:
+            chunks = stream_view_file(filepath)
+            staged = stage_stream(filepath, chunks) if chunks is not None else None
+        except NeedsWholeFile:
+            pass  # the stream cannot match the whole-file rewrite: read it whole below
+        else:
+            if staged:
+                return FileResult(filepath, FIXED, f"Fixed VIEW: {filepath}", staged)
+            return FileResult(filepath, SKIPPED, '')
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    original = content
+    content = fix_view_content(content)
+    
+    if content != original:
+        return FileResult(filepath, FIXED, f"Fixed VIEW: {filepath}", stage(filepath, content))
+    return FileResult(filepath, SKIPPED, '')
+
+def fix_edit_page(filepath):
+    if not os.path.exists(filepath):
+        return FileResult(filepath, SKIPPED, '')
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    original = content
+    content = fix_edit_content(content)
+    
+    if content != original:
+        return FileResult(filepath, FIXED, f"Fixed EDIT: {filepath}", stage(filepath, content))
+    return FileResult(filepath, SKIPPED, '')
+
+def fix_list_page(filepath):
+    if not os.path.exists(filepath):
+        return FileResult(filepath, SKIPPED, '')
+
+    if streams(filepath):
+        try:
+            staged = stage_stream(filepath, stream_list_file(filepath))
+        except NeedsWholeFile:
+            pass  # the stream cannot match the whole-file rewrite: read it whole below
+        else:
+            if staged:
+                return FileResult(filepath, FIXED, f"Fixed LIST: {filepath}", staged)
+            return FileResult(filepath, SKIPPED, '')
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    original = content
+    content = fix_list_content(content)
+    
+    if content != original:
+        return FileResult(filepath, FIXED, f"Fixed LIST: {filepath}", stage(filepath, content))
+    return FileResult(filepath, SKIPPED, '')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fix snake_case property access in service pages')
+    parser.add_argument('--base-path', default=base_path, help='services directory to fix')
+    add_jobs_argument(parser)
+    add_profile_arguments(parser)
+    add_prefilter_argument(parser)
+    add_since_argument(parser)
+    add_validate_argument(parser)
+    add_diff_argument(parser)
+    args = parser.parse_args(argv)
+    out = status_stream(args)
+    changes = changes_for(parser, args, args.base_path)
+
+    tasks = []
+    for module in modules:
+        module_path = os.path.join(args.base_path, module)
+        tasks.append((fix_list_page, os.path.join(module_path, 'page.tsx')))
+        tasks.append((fix_edit_page, os.path.join(module_path, '[id]', 'edit', 'page.tsx')))
+        tasks.append((fix_view_page, os.path.join(module_path, '[id]', 'page.tsx')))
+
+    print("Fixing service modules...", file=out)
+    selected = filter_tasks(tasks, changes, out=out)
+    if args.prefilter:
+        prefilters = {
+            fix_list_page: Prefilter(tokens_for('list', ['list-properties']), args.base_path),
+            fix_edit_page: Prefilter(tokens_for('edit', ['edit-properties']), args.base_path),
+            fix_view_page: Prefilter(tokens_for('view', ['view-properties']), args.base_path),
+        }
+        selected, _ = partition(selected, lambda task: prefilters[task[0]])
+
+    profile = report_for(args)
+    done = dict(zip(selected, run_or_preview(selected, args, profile)))
+    results = [done.get(task) or FileResult(task[1], SKIPPED, '') for task in tasks]
+    if args.validate:
+        results = validate_results(results, args.jobs)
+    commit_results(results, args.base_path)
+
+    for index, module in enumerate(modules):
+        print(f"\n{module}:", file=out)
+        for result in results[index * 3:index * 3 + 3]:
+            if result.message:
+                print(result.message, file=out)
+
+    print("\nDone!", file=out)
+    finish_profile(profile, args)
+    return 1 if count_errors(results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Generate all service module pages for Phase 5
+This script creates 40 pages (10 modules × 4 pages each): list, create,
+edit and details, rendered and written in one streaming pass
+"""
+
+import argparse
+import os
+import json
+import sys
+
+from crm_tools.changes import add_since_argument, changes_for
+from crm_tools.atomic import Batch
+from crm_tools.manifest import (
+    KeyRecorder, content_hash, deps_hash, is_fresh, load_manifest, manifest_path, manifest_text,
+)
+from crm_tools.output import write_stream
+from crm_tools.templates import compile_template, pascal
+from crm_tools.watch import DEFAULT_DEBOUNCE_MS, add_watch_arguments, load_script, watch
+
+# Template edits are picked up by their fingerprint; bump this when the way
+# slots are derived (SLOTS below) changes so every page is rendered again.
+TEMPLATE_VERSION = 3
+
+BASE_PATH = r'C:\Users\fatih\Desktop\CRM\frontend\src\app\(dashboard)\dashboard\services'
+
+# Module configurations
+MODULES = {
+    'guides': {
+        'singular': 'Guide',
+        'plural': 'Guides',
+        'icon': 'Users',
+        'description': 'Manage tour guides',
+        'has_city': False,
+        'has_image': True,
+        'key_field': 'guide_name',
+        'list_columns': ['guide_name', 'phone', 'email', 'languages', 'daily_rate', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Basic Information', 'fields': ['guide_name', 'phone', 'email']},
+            {'title': 'Languages & Specializations', 'fields': ['languages', 'specializations', 'license_number']},
+            {'title': 'Rates', 'fields': ['daily_rate', 'half_day_rate', 'night_rate', 'transfer_rate', 'currency']},
+            {'title': 'Additional', 'fields': ['profile_picture_url', 'notes', 'is_active']},
+        ]
+    },
+    'restaurants': {
+        'singular': 'Restaurant',
+        'plural': 'Restaurants',
+        'icon': 'UtensilsCrossed',
+        'description': 'Manage restaurants',
+        'has_city': True,
+        'has_image': True,
+        'key_field': 'restaurant_name',
+        'list_columns': ['restaurant_name', 'city', 'cuisine_type', 'lunch_price', 'dinner_price', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Basic Information', 'fields': ['restaurant_name', 'city_id', 'address', 'phone']},
+            {'title': 'Details', 'fields': ['cuisine_type', 'capacity', 'menu_options']},
+            {'title': 'Pricing', 'fields': ['lunch_price', 'dinner_price', 'currency']},
+            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
+        ]
+    },
+    'entrance-fees': {
+        'singular': 'Entrance Fee',
+        'plural': 'Entrance Fees',
+        'icon': 'Ticket',
+        'description': 'Manage entrance fees',
+        'has_city': True,
+        'has_image': True,
+        'key_field': 'site_name',
+        'list_columns': ['site_name', 'city', 'adult_price', 'child_price', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Basic Information', 'fields': ['site_name', 'city_id']},
+            {'title': 'Pricing', 'fields': ['adult_price', 'child_price', 'student_price', 'senior_price', 'currency']},
+            {'title': 'Visiting Information', 'fields': ['opening_hours', 'best_visit_time']},
+            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
+        ]
+    },
+    'extras': {
+        'singular': 'Extra Expense',
+        'plural': 'Extra Expenses',
+        'icon': 'DollarSign',
+        'description': 'Manage extra expenses',
+        'has_city': False,
+        'has_image': False,
+        'key_field': 'expense_name',
+        'list_columns': ['expense_name', 'expense_category', 'price', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Basic Information', 'fields': ['expense_name', 'expense_category']},
+            {'title': 'Pricing', 'fields': ['price', 'currency']},
+            {'title': 'Additional', 'fields': ['description', 'notes', 'is_active']},
+        ]
+    },
+    'vehicle-companies': {
+        'singular': 'Vehicle Company',
+        'plural': 'Vehicle Companies',
+        'icon': 'Building2',
+        'description': 'Manage vehicle companies',
+        'has_city': False,
+        'has_image': False,
+        'key_field': 'company_name',
+        'list_columns': ['company_name', 'contact_person', 'phone', 'email', 'is_active'],
+        'form_sections': [
+            {'title': 'Company Information', 'fields': ['company_name']},
+            {'title': 'Contact Details', 'fields': ['contact_person', 'phone', 'email']},
+            {'title': 'Additional', 'fields': ['notes', 'is_active']},
+        ]
+    },
+    'vehicle-types': {
+        'singular': 'Vehicle Type',
+        'plural': 'Vehicle Types',
+        'icon': 'Car',
+        'description': 'Manage vehicle types',
+        'has_city': False,
+        'has_image': False,
+        'key_field': 'vehicle_type',
+        'list_columns': ['vehicle_type', 'vehicle_company_id', 'capacity', 'luggage_capacity', 'is_active'],
+        'form_sections': [
+            {'title': 'Basic Information', 'fields': ['vehicle_company_id', 'vehicle_type']},
+            {'title': 'Capacity', 'fields': ['capacity', 'luggage_capacity']},
+            {'title': 'Additional', 'fields': ['notes', 'is_active']},
+        ]
+    },
+    'vehicle-rentals': {
+        'singular': 'Vehicle Rental',
+        'plural': 'Vehicle Rentals',
+        'icon': 'KeyRound',
+        'description': 'Manage vehicle rental pricing',
+        'has_city': False,
+        'has_image': False,
+        'key_field': 'vehicle_type_id',
+        'list_columns': ['vehicle_company_id', 'vehicle_type_id', 'full_day_price', 'half_day_price', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Vehicle Selection', 'fields': ['vehicle_company_id', 'vehicle_type_id']},
+            {'title': 'Full Day Rental', 'fields': ['full_day_price', 'full_day_hours', 'full_day_km']},
+            {'title': 'Half Day Rental', 'fields': ['half_day_price', 'half_day_hours', 'half_day_km']},
+            {'title': 'Night Rental', 'fields': ['night_rental_price', 'night_rental_hours', 'night_rental_km']},
+            {'title': 'Extra Charges', 'fields': ['extra_hour_rate', 'extra_km_rate', 'currency']},
+            {'title': 'Additional', 'fields': ['notes', 'is_active']},
+        ]
+    },
+    'transfer-routes': {
+        'singular': 'Transfer Route',
+        'plural': 'Transfer Routes',
+        'icon': 'Route',
+        'description': 'Manage transfer routes',
+        'has_city': False,
+        'has_image': False,
+        'key_field': 'from_city_id',
+        'list_columns': ['from_city_id', 'to_city_id', 'vehicle_company_id', 'price_per_vehicle', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Route Information', 'fields': ['vehicle_company_id', 'from_city_id', 'to_city_id', 'vehicle_type_id']},
+            {'title': 'Pricing & Details', 'fields': ['price_per_vehicle', 'currency', 'duration_hours', 'distance_km']},
+            {'title': 'Additional', 'fields': ['notes', 'is_active']},
+        ]
+    },
+    'tour-companies': {
+        'singular': 'Tour Company',
+        'plural': 'Tour Companies',
+        'icon': 'Flag',
+        'description': 'Manage tour companies',
+        'has_city': False,
+        'has_image': True,
+        'key_field': 'company_name',
+        'list_columns': ['company_name', 'tour_name', 'tour_type', 'duration_days', 'sic_price', 'currency', 'is_active'],
+        'form_sections': [
+            {'title': 'Company & Tour Information', 'fields': ['company_name', 'tour_name', 'tour_type']},
+            {'title': 'Duration', 'fields': ['duration_days', 'duration_hours']},
+            {'title': 'SIC Pricing', 'fields': ['sic_price', 'currency']},
+            {'title': 'Private Tour Pricing', 'fields': ['pvt_price_2_pax', 'pvt_price_4_pax', 'pvt_price_6_pax', 'pvt_price_8_pax', 'pvt_price_10_pax']},
+            {'title': 'Capacity', 'fields': ['min_passengers', 'max_passengers']},
+            {'title': 'Tour Details', 'fields': ['itinerary', 'inclusions', 'exclusions']},
+            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
+        ]
+    },
+    'suppliers': {
+        'singular': 'Supplier',
+        'plural': 'Suppliers',
+        'icon': 'Package',
+        'description': 'Manage suppliers',
+        'has_city': True,
+        'has_image': False,
+        'key_field': 'company_name',
+        'list_columns': ['company_name', 'supplier_type', 'contact_person', 'phone', 'email', 'is_active'],
+        'form_sections': [
+            {'title': 'Company Information', 'fields': ['supplier_type', 'company_name']},
+            {'title': 'Contact Details', 'fields': ['contact_person', 'email', 'phone']},
+            {'title': 'Address', 'fields': ['address', 'city_id']},
+            {'title': 'Business Details', 'fields': ['tax_id', 'payment_terms', 'bank_account_info']},
+            {'title': 'Additional', 'fields': ['notes', 'is_active']},
+        ]
+    },
+}
+
+LIST_PAGE = compile_template('''// This file was auto-generated by generate_services_pages.py
+// Manual edits may be overwritten
+'use client';
+
+import { useState } from 'react';
+import { {% hook %} } from '@/hooks/use-{% hook_name %}';
+import { DataTable } from '@/components/ui/data-table/DataTable';
+import { ColumnDef } from '@tanstack/react-table';
+import { {% singular_pascal %} } from '@/types/services';
+import { Button } from '@/components/ui/button';
+import { Input } from '@/components/ui/input';
+import { Plus, Search, Pencil, Eye, Trash2 } from 'lucide-react';
+import Link from 'next/link';
+import { useRouter } from 'next/navigation';
+import { StatusBadge } from '@/components/shared/StatusBadge';
+import { ConfirmDialog } from '@/components/shared/ConfirmDialog';
+import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
+
+export default function {% plural_pascal %}Page() {
+  const router = useRouter();
+  const [search, setSearch] = useState('');
+  const [page, setPage] = useState(1);
+  const limit = 10;
+
+  const { {% hook_name %}: data, pagination, isLoading, delete{% singular_pascal %}: deleteItem, isDeleting } = {% hook %}({
+    page,
+    limit,
+    search: search || undefined,
+  });
+
+  const columns: ColumnDef<{% singular_pascal %}>[] = [
+    {
+      accessorKey: '{% key_field %}',
+      header: '{% key_field_label %}',
+    },
+    {
+      accessorKey: 'is_active',
+      header: 'Status',
+      cell: ({ row }) => (
+        <StatusBadge status={row.original.is_active ? 'Active' : 'Inactive'} />
+      ),
+    },
+    {
+      id: 'actions',
+      header: 'Actions',
+      cell: ({ row }) => (
+        <div className="flex items-center gap-2">
+          <Button
+            variant="ghost"
+            size="sm"
+            onClick={() => router.push(`{% route_base %}/${row.original.id}`)}
+          >
+            <Eye className="h-4 w-4" />
+          </Button>
+          <Button
+            variant="ghost"
+            size="sm"
+            onClick={() => router.push(`{% route_base %}/${row.original.id}/edit`)}
+          >
+            <Pencil className="h-4 w-4" />
+          </Button>
+          <ConfirmDialog
+            title="Delete {% singular %}"
+            description="Are you sure you want to delete this {% singular_lower %}? This action cannot be undone."
+            onConfirm={() => deleteItem(row.original.id)}
+            trigger={
+              <Button variant="ghost" size="sm" disabled={isDeleting}>
+                <Trash2 className="h-4 w-4 text-red-600" />
+              </Button>
+            }
+          />
+        </div>
+      ),
+    },
+  ];
+
+  return (
+    <div className="space-y-6">
+      <div className="flex items-center justify-between">
+        <div>
+          <h1 className="text-3xl font-bold text-gray-900">{% plural %}</h1>
+          <p className="text-gray-600">{% description %}</p>
+        </div>
+        <Link href="{% route_base %}/create">
+          <Button>
+            <Plus className="h-4 w-4 mr-2" />
+            Add {% singular %}
+          </Button>
+        </Link>
+      </div>
+
+      <Card>
+        <CardHeader>
+          <CardTitle>Search & Filter</CardTitle>
+        </CardHeader>
+        <CardContent>
+          <div className="flex gap-4">
+            <div className="flex-1">
+              <div className="relative">
+                <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-gray-400 h-4 w-4" />
+                <Input
+                  placeholder="Search {% plural_lower %}..."
+                  value={search}
+                  onChange={(e) => setSearch(e.target.value)}
+                  className="pl-10"
+                />
+              </div>
+            </div>
+          </div>
+        </CardContent>
+      </Card>
+
+      <Card>
+        <CardContent className="pt-6">
+          <DataTable
+            columns={columns}
+            data={data}
+            pageCount={pagination?.totalPages || 0}
+            currentPage={page}
+            onPageChange={setPage}
+            isLoading={isLoading}
+          />
+        </CardContent>
+      </Card>
+    </div>
+  );
+}
+''')
+
+
+# Template slot -> how it is derived from (module key, config). Pages only
+# evaluate the slots their template uses, which is how the manifest learns
+# which config keys each page depends on.
+SLOTS = {
+    'module_key': lambda module_key, config: module_key,
+    'route_base': lambda module_key, config: f'/dashboard/services/{module_key}',
+    'hook_name': lambda module_key, config: module_key.replace('-', '_'),
+    'hook': lambda module_key, config: f"use{pascal(config['singular'])}s",
+    'singular': lambda module_key, config: config['singular'],
+    'singular_lower': lambda module_key, config: config['singular'].lower(),
+    'singular_pascal': lambda module_key, config: pascal(config['singular']),
+    'plural': lambda module_key, config: config['plural'],
+    'plural_lower': lambda module_key, config: config['plural'].lower(),
+    'plural_pascal': lambda module_key, config: pascal(config['plural']),
+    'description': lambda module_key, config: config['description'],
+    'key_field': lambda module_key, config: config['key_field'],
+    'key_field_label': lambda module_key, config: config['key_field'].replace('_', ' ').title(),
+}
+
+
+def page_context(module_key, config, slots=None):
+    """Slot values for a module's pages, all of them or just `slots`"""
+    names = SLOTS if slots is None else slots
+    return {name: SLOTS[name](module_key, config) for name in names}
+
+
+CREATE_PAGE = compile_template(''''use client';
+
+export default function Create{% singular_pascal %}Page() {
+  return (
+    <div className="p-6">
+      <h1 className="text-2xl font-bold mb-4">Create {% singular_pascal %}</h1>
+      <p className="text-gray-600">Implementation in progress...</p>
+    </div>
+  );
+}
+''')
+
+EDIT_PAGE = compile_template(''''use client';
+
+export default function Edit{% singular_pascal %}Page() {
+  return (
+    <div className="p-6">
+      <h1 className="text-2xl font-bold mb-4">Edit {% singular_pascal %}</h1>
+      <p className="text-gray-600">Implementation in progress...</p>
+    </div>
+  );
+}
+''')
+
+DETAILS_PAGE = compile_template(''''use client';
+
+export default function {% singular_pascal %}DetailsPage() {
+  return (
+    <div className="p-6">
+      <h1 className="text-2xl font-bold mb-4">{% singular_pascal %} Details</h1>
+      <p className="text-gray-600">Implementation in progress...</p>
+    </div>
+  );
+}
+''')
+
+# Page kind -> (path inside the module directory, template)
+PAGE_KINDS = {
+    'list': ('page.tsx', LIST_PAGE),
+    'create': ('create/page.tsx', CREATE_PAGE),
+    'edit': ('[id]/edit/page.tsx', EDIT_PAGE),
+    'details': ('[id]/page.tsx', DETAILS_PAGE),
+}
+
+
+def generate_list_page(module_key, config, context=None):
+    """Generate list page for a module"""
+    if context is None:
+        context = page_context(module_key, config)
+    return LIST_PAGE.render(context)
+
+
+# Text only this generator's pages contain; other existing pages are real
+# implementations and are never overwritten without --force
+GENERATED_MARKERS = ('auto-generated by generate_services_pages.py', 'Implementation in progress...')
+
+
+def overwritable(path, entry):
+    """True when the page at `path` is missing or still exactly what we generated"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            current = f.read()
+    except FileNotFoundError:
+        return True
+    except (OSError, UnicodeDecodeError):
+        return False
+    if entry and 'output' in entry:
+        return entry['output'] == content_hash(current)
+    return any(marker in current for marker in GENERATED_MARKERS)
+
+
+def iter_pages(base_path, modules, kinds, manifest, skipped=None, force=False, kept=None):
+    """Lazily yield (rel_path, content, meta) for every page that needs writing.
+
+    A page is fresh when the config keys it read last time (its manifest
+    `deps`) and its template still hash the same; fresh pages are not
+    rendered at all and their paths are appended to `skipped` instead.
+    Unless `force` is set, stale pages that were edited by hand or never
+    generated are left alone and appended to `kept`.
+    """
+    for module_key, config in modules.items():
+        for kind in kinds:
+            page_path, template = PAGE_KINDS[kind]
+            rel_path = f'{module_key}/{page_path}'
+            fingerprint = f'{kind}-v{TEMPLATE_VERSION}-{template.fingerprint}'
+            entry = manifest.get(rel_path)
+            if not force and entry and is_fresh(manifest, base_path, rel_path, deps_hash(config, entry['deps'], fingerprint)):
+                if skipped is not None:
+                    skipped.append(rel_path)
+                continue
+            if not force and not overwritable(os.path.join(base_path, rel_path), entry):
+                if kept is not None:
+                    kept.append(rel_path)
+                continue
+            recorder = KeyRecorder(config)
+            context = page_context(module_key, recorder, template.slots)
+            deps = sorted(recorder.read)
+            content = template.render(context)
+            meta = {
+                'module': module_key, 'kind': kind, 'hash': deps_hash(config, deps, fingerprint), 'deps': deps,
+                'output': content_hash(content),
+            }
+            yield rel_path, content, meta
+
+
+def generate(base_path, modules=None, kinds=None, force=False, kept=None):
+    """Render and write pages, returning (written, skipped) relative paths.
+
+    Pages protected from overwriting are appended to `kept`.
+    """
+    modules = MODULES if modules is None else modules
+    kinds = list(PAGE_KINDS) if kinds is None else kinds
+    manifest = load_manifest(base_path)
+    skipped = []
+    unchanged = []
+
+    # Pages and manifest go into one batch, so a rollback restores both
+    with Batch(base_path) as batch:
+        pages = iter_pages(base_path, modules, kinds, manifest, skipped, force, kept)
+        written = write_stream(base_path, pages, unchanged=unchanged, batch=batch)
+        for rel_path, meta in written + unchanged:
+            manifest[rel_path] = meta
+        batch.write(manifest_path(base_path), manifest_text(manifest))
+    skipped.extend(rel_path for rel_path, _ in unchanged)
+    return written, skipped
+
+
+def changed_modules(changes, base_path, kinds=None):
+    """Module configs that changed since the revision, or whose pages did"""
+    if changes.literal_at(__file__, 'TEMPLATE_VERSION') != TEMPLATE_VERSION:
+        print(f'[WARN] --since {changes.since}: TEMPLATE_VERSION changed or unreadable there, '
+              'generating every module')
+        return dict(MODULES)
+    keys = changes.changed_keys(__file__, 'MODULES', MODULES)
+    kinds = list(PAGE_KINDS) if kinds is None else kinds
+    for module_key in MODULES:
+        for kind in kinds:
+            if changes.touches(os.path.join(base_path, module_key, PAGE_KINDS[kind][0])):
+                keys.add(module_key)
+    return {key: config for key, config in MODULES.items() if key in keys}
+
+
+def page_paths(base_path, modules, kinds):
+    """Absolute output path -> (module, kind) for every page"""
+    return {
+        os.path.abspath(os.path.join(base_path, module_key, PAGE_KINDS[kind][0])): (module_key, kind)
+        for module_key in modules for kind in kinds
+    }
+
+
+def watch_pages(base_path, kinds=None, debounce_ms=DEFAULT_DEBOUNCE_MS, poll=False):
+    """Regenerate pages whenever this script's MODULES/templates change or a page is deleted.
+
+    The loaded script is kept between rebuilds; on a source change it is
+    re-executed and compared with the previous one. Modules whose config
+    changed and kinds whose template changed are checked against the
+    manifest, which re-renders only the pages whose dependencies moved.
+    """
+    source = os.path.abspath(__file__)
+    kinds = list(PAGE_KINDS) if kinds is None else kinds
+    state = {'script': sys.modules[__name__]}
+
+    def rebuild(changed):
+        current = state['script']
+        todo = {}  # module -> kinds to check against the manifest
+        if source in changed:
+            try:
+                fresh = load_script(source)
+            except Exception as e:
+                print(f'[ERROR] {source}: {type(e).__name__}: {e}')
+                return None
+            # compile_template reuses parses, so an unchanged template is the same object
+            stale_kinds = [kind for kind in kinds if fresh.PAGE_KINDS.get(kind) != current.PAGE_KINDS.get(kind)]
+            for module_key, config in fresh.MODULES.items():
+                if fresh.TEMPLATE_VERSION != current.TEMPLATE_VERSION or current.MODULES.get(module_key) != config:
+                    todo[module_key] = set(kinds)
+                elif stale_kinds:
+                    todo.setdefault(module_key, set()).update(stale_kinds)
+            state['script'] = current = fresh
+
+        # Deleted pages come back; edits to existing pages are left alone
+        for path, (module_key, kind) in page_paths(base_path, current.MODULES, kinds).items():
+            if path in changed and not os.path.exists(path):
+                todo.setdefault(module_key, set()).add(kind)
+
+        for module_key, module_kinds in todo.items():
+            written, _ = current.generate(
+                base_path, {module_key: current.MODULES[module_key]},
+                [kind for kind in kinds if kind in module_kinds],
+            )
+            for rel_path, meta in written:
+                print(f'[OK] Created {rel_path} ({meta["kind"]})')
+        return [source, *page_paths(base_path, current.MODULES, kinds)]
+
+    watch([source, *page_paths(base_path, MODULES, kinds)], rebuild, debounce_ms, poll)
+
+
+def main(argv=None):
+    """Generate all service pages"""
+    parser = argparse.ArgumentParser(description='Generate service module pages')
+    parser.add_argument('--base-path', default=BASE_PATH, help='services directory to write pages into')
+    parser.add_argument(
+        '--force', action='store_true',
+        help='regenerate every page, ignoring the manifest and overwriting pages edited by hand',
+    )
+    parser.add_argument(
+        '--kind', action='append', dest='kinds', choices=list(PAGE_KINDS),
+        help='only generate this page kind (repeatable, default: all four)',
+    )
+    add_since_argument(parser)
+    add_watch_arguments(parser)
+    args = parser.parse_args(argv)
+
+    modules = None
+    changes = changes_for(parser, args, args.base_path)
+    if changes is not None:
+        modules = changed_modules(changes, args.base_path, args.kinds)
+    kept = []
+    written, skipped = generate(args.base_path, modules, kinds=args.kinds, force=args.force, kept=kept)
+    for rel_path in skipped:
+        print(f'[SKIP] {rel_path} is up to date')
+    for rel_path in kept:
+        print(f'[KEEP] {rel_path} was edited by hand or not generated here (use --force to overwrite)')
+    for rel_path, meta in written:
+        print(f'[OK] Created {rel_path} ({meta["kind"]})')
+    print('\n[OK] All service pages generated successfully!')
+
+    if args.watch:
+        watch_pages(args.base_path, args.kinds, args.debounce, args.poll)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
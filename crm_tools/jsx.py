@@ -0,0 +1,186 @@
+"""
+Linear-time structural matching for JSX in .tsx pages.
+
+These helpers replace regexes such as `<ConfirmDialog[^>]*trigger=...` that
+can backtrack catastrophically on large or malformed pages. Every scan moves
+strictly forward through the text, so matching all elements of a page costs
+O(n). Scans also honour the per-file time budget from crm_tools.budget.
+"""
+
+import re
+
+from crm_tools.budget import check_budget
+
+_NAME = re.compile(r'[A-Za-z_$][\w$.:-]*')
+
+# How many characters to scan between budget checks
+_CHECK_EVERY = 4096
+
+
+class ScanError(ValueError):
+    """Raised when a tag cannot be scanned"""
+
+
+class Unterminated(ScanError):
+    """Raised when a brace, string or element runs off the end of the text"""
+
+
+def skip_string(text, i):
+    """Return the index just past the quoted string starting at text[i].
+
+    Single- and double-quoted strings stop at an unescaped quote or a
+    newline, so a stray apostrophe damages at most one line.
+    """
+    quote = text[i]
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == quote or c == '\n':
+            return i + 1
+        i += 1
+    raise Unterminated(f'unterminated string at offset {n}')
+
+
+def skip_braces(text, i):
+    """Return the index just past the `}` matching the `{` at text[i].
+
+    Strings, template literals (including nested `${...}`) and comments are
+    skipped, so braces inside them are not counted.
+    """
+    n = len(text)
+    # Stack of open contexts: '{' for braces, '`' for template literals
+    stack = []
+    start = i
+    next_check = i + _CHECK_EVERY
+    while i < n:
+        if i >= next_check:
+            check_budget()
+            next_check = i + _CHECK_EVERY
+
+        c = text[i]
+        if stack and stack[-1] == '`':
+            if c == '\\':
+                i += 2
+            elif c == '`':
+                stack.pop()
+                i += 1
+            elif c == '$' and text.startswith('${', i):
+                stack.append('{')
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if c == '{':
+            stack.append('{')
+            i += 1
+        elif c == '}':
+            stack.pop()
+            i += 1
+            if not stack:
+                return i
+        elif c == '`':
+            stack.append('`')
+            i += 1
+        elif c == '"' or c == "'":
+            i = skip_string(text, i)
+        elif c == '/' and text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = n if newline == -1 else newline + 1
+        elif c == '/' and text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        else:
+            i += 1
+    raise Unterminated(f'unbalanced brace at offset {start}')
+
+
+def _skip_expression(text, i, index):
+    if index is None:
+        return skip_braces(text, i)
+    close = index.matching(i)
+    if close is None:
+        raise ScanError(f'unbalanced brace at offset {i}')
+    return close + 1
+
+
+def scan_tag(text, i, index=None):
+    """Scan the opening tag starting at `<` on text[i].
+
+    Returns (end, attrs, self_closing) where `end` is the index just past the
+    closing `>` or `/>` and `attrs` is the list of attribute names. With a
+    TokenIndex for `text`, attribute braces are looked up instead of scanned.
+    """
+    check_budget()
+    n = len(text)
+    name = _NAME.match(text, i + 1)
+    if not name:
+        raise ScanError(f'no element name at offset {i}')
+    i = name.end()
+    attrs = []
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif c == '/' and text.startswith('/>', i):
+            return i + 2, attrs, True
+        elif c == '>':
+            return i + 1, attrs, False
+        elif c == '{':
+            # Spread attribute: {...props}
+            i = _skip_expression(text, i, index)
+        else:
+            attr = _NAME.match(text, i)
+            if not attr:
+                raise ScanError(f'unexpected {c!r} in tag at offset {i}')
+            attrs.append(attr.group())
+            i = attr.end()
+            while i < n and text[i].isspace():
+                i += 1
+            if i < n and text[i] == '=':
+                i += 1
+                while i < n and text[i].isspace():
+                    i += 1
+                if i >= n:
+                    break
+                if text[i] == '{':
+                    i = _skip_expression(text, i, index)
+                elif text[i] in '"\'':
+                    # JSX attribute strings may span lines and have no escapes
+                    end = text.find(text[i], i + 1)
+                    if end == -1:
+                        break
+                    i = end + 1
+                else:
+                    raise ScanError(f'bad attribute value at offset {i}')
+    raise Unterminated(f'unterminated tag at offset {n}')
+
+
+def find_elements(text, name, index=None):
+    """Yield (start, end, attrs, self_closing) for each `<name` opening tag.
+
+    The text is scanned once from left to right. A malformed tag (say a
+    generic `<Name<P>`) is skipped; one that runs off the end of the text
+    stops the scan, since no later tag could be closed either.
+    """
+    opener = '<' + name
+    i = text.find(opener)
+    while i != -1:
+        after = i + len(opener)
+        if after < len(text) and (text[after].isalnum() or text[after] in '_$.'):
+            # A longer element name such as <ConfirmDialogContent
+            i = text.find(opener, after)
+            continue
+        try:
+            end, attrs, self_closing = scan_tag(text, i, index)
+        except Unterminated:
+            return
+        except ScanError:
+            i = text.find(opener, after)
+            continue
+        yield i, end, attrs, self_closing
+        i = text.find(opener, end)
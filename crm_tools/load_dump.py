@@ -0,0 +1,305 @@
+"""
+Load a backend SQL backup into a local SQLite database.
+
+The backups in backend/database/ are `-- Table:` sections of single-row
+`INSERT INTO t (...) VALUES (...);` statements. Replaying them one
+statement at a time is slow, so the loader:
+
+1. scans the dump once in binary to find every table section, cut into
+   line-aligned chunks of about `CHUNK_BYTES`;
+2. parses the chunks (in a process pool with --jobs), reading Postgres
+   literals: 'text' with '' escapes and optional ::casts, NULL, true/false
+   and numbers. Timestamps stay ISO-8601 text, which SQLite's date
+   functions read as is;
+3. inserts each chunk's rows with one executemany in one transaction.
+
+With --table, the dump_index sidecar points straight at the selected
+sections instead.
+
+The database is built in a temp file and renamed over the output at the
+end, so an interrupted load never leaves a half-filled database behind.
+
+Usage:
+    python -m crm_tools.load_dump [--dump FILE] [--table NAME ...] [--jobs N] OUT.sqlite
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import sqlite3
+import sys
+import time
+from collections import deque, namedtuple
+
+from crm_tools.runner import add_jobs_argument, resolve_jobs
+from crm_tools.schema import DUMP_GLOB, _split_columns, latest_dump
+
+CHUNK_BYTES = 4 << 20
+
+Section = namedtuple('Section', ['name', 'columns', 'chunks'])
+
+_STATEMENT = re.compile(r'^INSERT INTO "?(\w+)"? \(([^)]*)\) VALUES\s*', re.M)
+# A trailing `::type` cast, which the values do not keep
+_CAST = r'(?:::[\w ]+(?:\[\])?)?'
+_STRING = re.compile(r"'((?:[^']|'')*)'" + _CAST + r'\s*')
+# A value inside a row: a quoted string (group 1) or a bare token (group 2)
+_VALUE = re.compile(r"'([^']*(?:''[^']*)*)'" + _CAST + r"|([^\s,()':][^\s,):]*)" + _CAST)
+_BARE = re.compile(r'([^,)]*?)\s*' + _CAST + r'\s*(?=[,)])')
+_SPACE = re.compile(r'\s*')
+
+_KEYWORDS = {'NULL': None, 'null': None, 'true': 1, 'false': 0, 'TRUE': 1, 'FALSE': 0}
+
+
+class DumpError(ValueError):
+    pass
+
+
+def iter_sections(path, chunk_bytes=CHUNK_BYTES, start=0, end=None):
+    """Yield a Section per table, with the (start, end) byte ranges of its INSERT lines.
+
+    `start`/`end` limit the scan to part of the dump, e.g. one table's
+    range from its dump_index sidecar.
+    """
+    section = None
+    chunk_start = None
+    offset = start
+
+    def close(at):
+        if chunk_start is not None:
+            section.chunks.append((chunk_start, at))
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for line in f:
+            if end is not None and offset >= end:
+                break
+            if line.startswith(b'-- '):
+                if line.startswith(b'-- Table: '):
+                    if section is not None:
+                        close(offset)
+                        yield section
+                    section = Section(line[10:].decode('utf-8').strip(), [], [])
+                    chunk_start = None
+                elif line.startswith(b'-- Columns: ') and section is not None:
+                    section.columns[:] = _split_columns(line[12:].decode('utf-8'))
+            elif line.startswith(b'INSERT INTO ') and section is not None:
+                if chunk_start is None:
+                    chunk_start = offset
+                elif offset - chunk_start >= chunk_bytes:
+                    close(offset)
+                    chunk_start = offset
+            offset += len(line)
+    if section is not None:
+        close(offset)
+        yield section
+
+
+def _bare_value(token):
+    if token in _KEYWORDS:
+        return _KEYWORDS[token]
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _fast_row(body):
+    row = []
+    for string, bare in _VALUE.findall(body):
+        if not bare:
+            row.append(string.replace("''", "'") if "''" in string else string)
+        elif bare in _KEYWORDS:
+            row.append(_KEYWORDS[bare])
+        elif bare.isdigit():
+            row.append(int(bare))
+        else:
+            row.append(_bare_value(bare))
+    return row
+
+
+def parse_row(text, pos):
+    """Parse the `(...)` tuple at text[pos]; returns (values, index past the `)`)"""
+    if text[pos] != '(':
+        raise DumpError(f'expected ( at offset {pos}')
+    values = []
+    pos = _SPACE.match(text, pos + 1).end()
+    while True:
+        if text.startswith("'", pos):
+            m = _STRING.match(text, pos)
+            if m is None:
+                raise DumpError(f'unterminated string at offset {pos}')
+            value = m.group(1)
+            values.append(value.replace("''", "'") if "''" in value else value)
+        else:
+            m = _BARE.match(text, pos)
+            if m is None:
+                raise DumpError(f'cannot read value at offset {pos}')
+            values.append(_bare_value(m.group(1)))
+        pos = m.end()
+        if pos >= len(text):
+            raise DumpError(f'unterminated row at offset {pos}')
+        if text[pos] == ')':
+            return values, pos + 1
+        if text[pos] != ',':
+            raise DumpError(f'expected , or ) at offset {pos}')
+        pos = _SPACE.match(text, pos + 1).end()
+
+
+def parse_chunk(path, start, end):
+    """Rows of the INSERT statements in bytes [start, end) of the dump.
+
+    Returns {(table, columns): [row, ...]}; runs in a worker.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    groups = {}
+    keys = {}
+    pos = 0
+    while True:
+        m = _STATEMENT.search(text, pos)
+        if m is None:
+            return groups
+        head = m.group(1, 2)
+        key = keys.get(head)
+        if key is None:
+            key = keys[head] = (head[0], tuple(_split_columns(head[1])))
+        rows = groups.setdefault(key, [])
+        pos = m.end()
+        # Usual case: one row that ends its line. An even number of quotes
+        # means the `);` is not inside a string
+        eol = text.find('\n', pos)
+        if eol == -1:
+            eol = len(text)
+        end = eol - 2 if text.startswith(');', eol - 2) else eol - 3
+        if (text.startswith(');', end) and text.count("'", pos, end) % 2 == 0
+                and text.find('),', pos, end) == -1):
+            rows.append(_fast_row(text[pos:end + 1]))
+            pos = eol
+            continue
+        # Multi-row VALUES (...), (...) and anything else the fast path does not take
+        while True:
+            try:
+                row, pos = parse_row(text, pos)
+            except (DumpError, IndexError) as e:
+                raise DumpError(f'{path}: {e} (chunk at byte {start})') from None
+            rows.append(row)
+            pos = _SPACE.match(text, pos).end()
+            if not text.startswith(',', pos):
+                break
+            pos = _SPACE.match(text, pos + 1).end()
+
+
+def _parse_all(path, chunks, jobs):
+    """Parsed chunks in order, with at most a few in flight per worker"""
+    jobs = min(resolve_jobs(jobs), len(chunks)) if chunks else 1
+    if jobs <= 1:
+        for start, end in chunks:
+            yield parse_chunk(path, start, end)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for start, end in chunks:
+            pending.append(executor.submit(parse_chunk, path, start, end))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def selected(name, patterns):
+    return not patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def load(dump, db_path, tables=None, jobs=1, chunk_bytes=CHUNK_BYTES):
+    """Build `db_path` from the dump; returns {table: rows loaded}"""
+    if tables:
+        # Only read the selected sections, found through the sidecar index
+        from crm_tools.dump_index import load_index, matching
+
+        sections = [
+            section
+            for entry in matching(load_index(dump), tables)
+            for section in iter_sections(dump, chunk_bytes, entry.start, entry.end)
+        ]
+    else:
+        sections = list(iter_sections(dump, chunk_bytes))
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        # A throwaway build file: no journal, no fsync until the final rename
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        columns_of = {}
+        for section in sections:
+            if section.columns:
+                conn.execute(f'CREATE TABLE {_quote(section.name)} ({", ".join(map(_quote, section.columns))})')
+                columns_of[section.name] = section.columns
+
+        counts = {section.name: 0 for section in sections}
+        chunks = [chunk for section in sections for chunk in section.chunks]
+        for groups in _parse_all(dump, chunks, jobs):
+            conn.execute('BEGIN')
+            for (table, columns), rows in groups.items():
+                if table not in columns_of:
+                    conn.execute(f'CREATE TABLE {_quote(table)} ({", ".join(map(_quote, columns))})')
+                    columns_of[table] = list(columns)
+                conn.executemany(
+                    f'INSERT INTO {_quote(table)} ({", ".join(map(_quote, columns))}) '
+                    f'VALUES ({", ".join("?" * len(columns))})',
+                    rows,
+                )
+                counts[table] = counts.get(table, 0) + len(rows)
+            conn.execute('COMMIT')
+    except BaseException:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load a SQL backup into a local SQLite database')
+    parser.add_argument('output', help='SQLite file to create (replaced if it exists)')
+    parser.add_argument('--dump', help=f'SQL backup to read (default: newest {DUMP_GLOB})')
+    parser.add_argument(
+        '--table', action='append', dest='tables', metavar='NAME',
+        help='only load this table; shell wildcards allowed (repeatable)',
+    )
+    add_jobs_argument(parser)
+    args = parser.parse_args(argv)
+
+    dump = args.dump or latest_dump()
+    if dump is None:
+        parser.error(f'no dump found matching {DUMP_GLOB}')
+    start = time.perf_counter()
+    try:
+        counts = load(dump, args.output, args.tables, args.jobs)
+    except DumpError as e:
+        print(f'[ERROR] {e}')
+        return 1
+    seconds = time.perf_counter() - start
+    for table, rows in counts.items():
+        if rows:
+            print(f'[OK] {table}: {rows} rows')
+    print(f'[DONE] {len(counts)} tables, {sum(counts.values())} rows in {seconds:.2f}s -> {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Content-hash manifest for generated pages.
+
+The manifest lives next to the output tree and maps each generated file
+(relative to the tree) to a hash of the inputs it was rendered from. A file
+whose inputs hash the same as last time can be skipped without rendering it.
+
+Each entry also lists `deps`, the config keys its render actually read (see
+`KeyRecorder`), and the hash covers only those keys plus a template
+fingerprint. Changing a key no page reads therefore regenerates nothing.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+MANIFEST_NAME = '.generated-manifest.json'
+MANIFEST_VERSION = 2
+
+
+def input_hash(config, template_version):
+    """Hash a module config together with the template version that renders it"""
+    payload = json.dumps(
+        {'config': config, 'template_version': template_version},
+        sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def content_hash(text):
+    """Hash of a rendered page, to tell later whether it was edited by hand"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def deps_hash(config, keys, fingerprint):
+    """Hash only the config keys a page depends on, with its template fingerprint"""
+    return input_hash({key: config.get(key) for key in sorted(keys)}, fingerprint)
+
+
+class KeyRecorder(Mapping):
+    """Read-only view of a config dict that records which top-level keys were read"""
+
+    def __init__(self, config):
+        self._config = config
+        self.read = set()
+
+    def __getitem__(self, key):
+        self.read.add(key)
+        return self._config[key]
+
+    def __contains__(self, key):
+        self.read.add(key)
+        return key in self._config
+
+    def __iter__(self):
+        self.read.update(self._config)
+        return iter(self._config)
+
+    def __len__(self):
+        return len(self._config)
+
+
+def manifest_path(base_path):
+    return os.path.join(base_path, MANIFEST_NAME)
+
+
+def load_manifest(base_path):
+    """Load the manifest for an output tree, or an empty one"""
+    try:
+        with open(manifest_path(base_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def manifest_text(files):
+    return json.dumps({'version': MANIFEST_VERSION, 'files': files}, indent=2, sort_keys=True) + '\n'
+
+
+def is_fresh(files, base_path, rel_path, digest):
+    """True when rel_path exists and was generated from the same inputs"""
+    entry = files.get(rel_path)
+    if not entry or entry.get('hash') != digest:
+        return False
+    return os.path.exists(os.path.join(base_path, rel_path))
@@ -0,0 +1,78 @@
+"""
+Streaming page writer.
+
+Generators yield `(rel_path, content, meta)` lazily; `write_stream` hands
+them to a writer thread through a bounded queue, so at most `max_in_flight`
+rendered pages are held in memory no matter how many modules there are.
+The writer stages each changed page next to its target and the whole run is
+committed as one batch at the end (see crm_tools.atomic); pages whose file
+already holds the rendered text are not written at all.
+"""
+
+import os
+import queue
+import threading
+
+from crm_tools.atomic import Batch, stage
+
+_DONE = object()
+
+
+def write_stream(base_path, pages, max_in_flight=16, unchanged=None, batch=None):
+    """Write every (rel_path, content, meta) from `pages` under base_path.
+
+    Returns the list of (rel_path, meta) actually written, in order. Pages
+    whose file already had the content are appended to `unchanged` instead.
+    With a caller's `batch`, pages are only staged into it and the caller
+    commits; otherwise they are committed before returning.
+    """
+    pending = queue.Queue(maxsize=max_in_flight)
+    owned = batch is None
+    if owned:
+        batch = Batch(base_path)
+    written = []
+    failure = []
+
+    def writer():
+        while True:
+            item = pending.get()
+            if item is _DONE:
+                return
+            if failure:
+                continue
+            rel_path, content, meta = item
+            path = os.path.join(base_path, rel_path)
+            # Any error is handed to the producer, which re-raises it; the
+            # thread keeps draining the queue so the producer never blocks
+            try:
+                tmp_path = stage(path, content)
+                if tmp_path is None:
+                    if unchanged is not None:
+                        unchanged.append((rel_path, meta))
+                    continue
+                batch.add(path, tmp_path)
+            except Exception as e:
+                failure.append(e)
+                continue
+            written.append((rel_path, meta))
+
+    thread = threading.Thread(target=writer, name='page-writer', daemon=True)
+    thread.start()
+    try:
+        try:
+            for page in pages:
+                if failure:
+                    break
+                pending.put(page)
+        finally:
+            pending.put(_DONE)
+            thread.join()
+        if failure:
+            raise failure[0]
+        if owned:
+            batch.commit()
+    except BaseException:
+        if owned:
+            batch.abort()
+        raise
+    return written
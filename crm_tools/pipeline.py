@@ -0,0 +1,130 @@
+"""
+Read-once/write-once codemod pipeline.
+
+Every service page is read a single time, pushed through the ordered stage
+chain registered for its kind (see crm_tools.stages) in memory, and written
+back only if the final text differs. Changed pages are staged and renamed
+into place together at the end of the run (see crm_tools.atomic), so an
+interrupted run leaves the tree as it was and a finished one can be undone
+with `python -m crm_tools.atomic rollback BASE_PATH`.
+
+Usage:
+    python -m crm_tools.pipeline [--base-path DIR] [--module NAME] [--stage NAME]
+                                 [--jobs N] [--time-budget SECONDS]
+                                 [--profile] [--profile-out FILE] [--no-prefilter]
+                                 [--since REV] [--no-validate]
+"""
+
+import argparse
+import os
+import sys
+
+from crm_tools import transforms  # noqa: F401  registers the built-in stages
+from crm_tools.atomic import commit_results, stage
+from crm_tools.changes import add_since_argument, changes_for, filter_tasks
+from crm_tools.prefilter import Prefilter, add_prefilter_argument, partition
+from crm_tools.preview import add_diff_argument, run_or_preview, status_stream
+from crm_tools.profiling import add_profile_arguments, finish as finish_profile, report_for
+from crm_tools.runner import (
+    FIXED, SKIPPED, ERROR, TIMEOUT, FileResult, add_budget_argument, add_jobs_argument,
+)
+from crm_tools.stages import STAGES, stages_for, tokens_for
+from crm_tools.validate import add_validate_argument, validate_results
+
+DEFAULT_BASE_PATH = 'frontend/src/app/(dashboard)/dashboard/services'
+
+# Page kind -> path of that page inside a module directory
+PAGE_KINDS = [
+    ('list', ('page.tsx',)),
+    ('edit', ('[id]', 'edit', 'page.tsx')),
+    ('view', ('[id]', 'page.tsx')),
+]
+
+
+def discover_pages(base_path, modules=None):
+    """Yield (path, kind) for every service page, module by module"""
+    if modules is None:
+        modules = sorted(
+            name for name in os.listdir(base_path)
+            if os.path.isdir(os.path.join(base_path, name))
+        )
+    for module in modules:
+        for kind, parts in PAGE_KINDS:
+            path = os.path.join(base_path, module, *parts)
+            if os.path.exists(path):
+                yield path, kind
+
+
+def apply_stages(content, kind, names=None):
+    """Run the stage chain for `kind` and return (content, names of stages that changed it)"""
+    changed = []
+    for current in stages_for(kind, names):
+        updated = current.transform(content)
+        if updated != content:
+            changed.append(current.name)
+            content = updated
+    return content, changed
+
+
+def run_file(path, kind, names=None):
+    with open(path, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    content, changed = apply_stages(original, kind, names)
+    if content == original:
+        return FileResult(path, SKIPPED, '')
+
+    return FileResult(path, FIXED, f'[OK] {path} ({", ".join(changed)})', stage(path, content))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run every page codemod in one read/write pass per file')
+    parser.add_argument('--base-path', default=DEFAULT_BASE_PATH, help='services directory to process')
+    parser.add_argument('--module', action='append', dest='modules', help='only process this module (repeatable)')
+    parser.add_argument(
+        '--stage', action='append', dest='stages', choices=sorted({s.name for s in STAGES}),
+        help='only run this stage (repeatable, default: all)',
+    )
+    add_jobs_argument(parser)
+    add_budget_argument(parser)
+    add_profile_arguments(parser)
+    add_prefilter_argument(parser)
+    add_since_argument(parser)
+    add_validate_argument(parser)
+    add_diff_argument(parser)
+    args = parser.parse_args(argv)
+    out = status_stream(args)
+    changes = changes_for(parser, args, args.base_path)
+
+    names = tuple(args.stages) if args.stages else None
+    tasks = [(run_file, path, kind, names) for path, kind in discover_pages(args.base_path, args.modules)]
+    tasks = filter_tasks(tasks, changes, out=out)
+    rejected = []
+    if args.prefilter:
+        prefilters = {kind: Prefilter(tokens_for(kind, names), args.base_path) for kind, _ in PAGE_KINDS}
+        tasks, rejected = partition(tasks, lambda task: prefilters[task[2]])
+    profile = report_for(args)
+    results = run_or_preview(tasks, args, profile)
+    if args.validate:
+        results = validate_results(results, args.jobs)
+    commit_results(results, args.base_path)
+
+    for result in results:
+        if result.message:
+            print(result.message, file=out)
+
+    counts = {status: 0 for status in (FIXED, SKIPPED, TIMEOUT, ERROR)}
+    counts[SKIPPED] = len(rejected)
+    for result in results:
+        counts[result.status] += 1
+    print(
+        f'[DONE] {counts[FIXED]} fixed, {counts[SKIPPED]} unchanged, '
+        f'{counts[TIMEOUT]} over budget, {counts[ERROR]} errors',
+        file=out,
+    )
+    finish_profile(profile, args)
+    return 1 if counts[ERROR] or counts[TIMEOUT] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
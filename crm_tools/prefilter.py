@@ -0,0 +1,141 @@
+"""
+Cheap "could any rule touch this file?" check run before any regex work.
+
+Every stage declares the literal tokens its rules need to see in a page
+(see crm_tools.stages). A `Prefilter` joins the tokens of the active stages
+into one bytes pattern and runs it over a memory-mapped view of each file,
+so a page that contains none of them is rejected without being decoded.
+
+Verdicts are cached by (path, size, mtime), keyed by the token set, so
+re-runs over a mostly migrated tree only stat each file. The cache lives in
+the user cache directory (crm_tools.cache.cache_root), one file per tree,
+never in the page sources.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+
+from crm_tools.cache import cache_root
+
+CACHE_VERSION = 1
+
+
+def _source(token):
+    if isinstance(token, str):
+        return re.escape(token)
+    return token.pattern
+
+
+def add_prefilter_argument(parser):
+    """Add the shared --no-prefilter option to an argparse parser"""
+    parser.add_argument(
+        '--no-prefilter', dest='prefilter', action='store_false',
+        help='process every file even when none of the rule tokens occur in it',
+    )
+
+
+def cache_path_for(tree):
+    """The verdict cache file for the tree at `tree`"""
+    digest = hashlib.sha256(os.path.abspath(tree).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_root(), f'prefilter-v{CACHE_VERSION}', digest + '.json')
+
+
+def scan(path, pattern):
+    """True when `pattern` occurs anywhere in the file at `path`"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return pattern.search(view) is not None
+
+
+class Prefilter:
+    """Accept/reject files for one set of tokens, with a persistent verdict cache.
+
+    `tokens` holds literal strings or compiled `re` patterns; None means
+    some active stage has no tokens, so every file is accepted. Verdicts are
+    cached per `tree` (the fixer's base path); None disables the cache.
+    """
+
+    def __init__(self, tokens, tree=None):
+        self.pattern = None
+        self.key = None
+        if tokens is not None:
+            sources = sorted({_source(token) for token in tokens})
+            self.key = hashlib.sha256('\n'.join(sources).encode('utf-8')).hexdigest()[:16]
+            self.pattern = re.compile('|'.join(sources).encode('utf-8')) if sources else None
+        self.cache_path = cache_path_for(tree) if tree else None
+        self.verdicts = self._load()
+        self.dirty = False
+
+    def _load(self):
+        if self.cache_path is None or self.key is None:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('sets', {}).get(self.key, {})
+
+    def accepts(self, path):
+        """False only when no rule token can occur in `path`"""
+        if self.key is None:
+            return True
+        try:
+            st = os.stat(path)
+        except OSError:
+            return True  # let the fixer report it
+        entry = self.verdicts.get(path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+
+        verdict = self.pattern is not None and scan(path, self.pattern)
+        self.verdicts[path] = [st.st_size, st.st_mtime_ns, verdict]
+        self.dirty = True
+        return verdict
+
+    def save(self):
+        """Merge this token set's verdicts into the cache file"""
+        if self.cache_path is None or not self.dirty:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION:
+                raise ValueError
+        except (OSError, ValueError):
+            data = {'version': CACHE_VERSION, 'sets': {}}
+        data['sets'][self.key] = self.verdicts
+        tmp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, sort_keys=True)
+                f.write('\n')
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            return  # an unwritable cache only costs a rescan next time
+        self.dirty = False
+
+
+def partition(tasks, prefilter_for):
+    """Split runner tasks `(func, path, *args)` into (accepted, rejected).
+
+    `prefilter_for(task)` picks the Prefilter for a task; every prefilter
+    used is saved afterwards.
+    """
+    used = {}
+    accepted, rejected = [], []
+    for task in tasks:
+        prefilter = prefilter_for(task)
+        used[id(prefilter)] = prefilter
+        (accepted if prefilter.accepts(task[1]) else rejected).append(task)
+    for prefilter in used.values():
+        prefilter.save()
+    return accepted, rejected
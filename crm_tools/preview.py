@@ -0,0 +1,123 @@
+"""
+Dry-run preview for the codemods: `--diff [FILE]` writes what a run would
+change as a unified diff (to stdout by default) and leaves every page as it is.
+
+Tasks run in the worker pool as usual, but inside `atomic.capture()`, so
+stage() keeps the new text in memory instead of writing a temp file. The
+worker validates it (unless --no-validate), turns it into a diff and sends
+back only that. Results stream back in task order with a few tasks in
+flight per worker (`runner.iter_tasks`) and each diff is written as soon as
+its turn comes, so neither the before/after text nor the diffs of a large
+tree are ever held at once. Output is identical for any --jobs.
+
+File names in the diff are relative to the git checkout holding the page
+(the current directory outside one), so the patch applies from anywhere in
+the repository whatever --base-path was. Scripts print their status lines
+to `status_stream(args)`, which is stderr while the diff goes to stdout, so
+stdout stays a clean patch:
+
+    python -m crm_tools.pipeline --diff > migration.patch
+    git apply --check migration.patch
+"""
+
+import difflib
+import os
+import sys
+from functools import lru_cache
+
+from crm_tools import atomic
+from crm_tools.runner import ERROR, iter_tasks, run_tasks
+
+
+def add_diff_argument(parser):
+    """Add the shared --diff option to an argparse parser"""
+    parser.add_argument(
+        '--diff', nargs='?', const='-', metavar='FILE',
+        help='write the changes as a unified diff to FILE (default: stdout) instead of the pages',
+    )
+
+
+def status_stream(args):
+    """Where a script prints its status lines: stderr while the diff goes to stdout"""
+    return sys.stderr if getattr(args, 'diff', None) == '-' else sys.stdout
+
+
+@lru_cache(maxsize=None)
+def _checkout_root(directory):
+    """The git working tree holding `directory` (absolute), or None"""
+    while True:
+        if os.path.exists(os.path.join(directory, '.git')):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def patch_name(path):
+    """`path` as a patch names it: relative to its git checkout, else to the current directory"""
+    path = os.path.abspath(path)
+    root = _checkout_root(os.path.dirname(path)) or os.getcwd()
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def unified_diff(path, before, after):
+    """git-style unified diff of one file (see patch_name for the file names)"""
+    name = patch_name(path)
+    lines = list(difflib.unified_diff(
+        before.splitlines(True), after.splitlines(True), f'a/{name}', f'b/{name}',
+    ))
+    for i, line in enumerate(lines):
+        if not line.endswith('\n'):
+            lines[i] = line + '\n\\ No newline at end of file\n'
+    return ''.join(lines)
+
+
+def preview_file(path, func, args, validate=True):
+    """Task: run `func(path, *args)` without writing; the result carries its diff"""
+    with atomic.capture() as captured:
+        result = func(path, *args)
+    if not result.staged:
+        return result
+    after = captured[result.staged]
+    try:
+        with open(path, 'r', encoding='utf-8', newline=None) as f:
+            before = f.read()
+    except FileNotFoundError:
+        before = ''
+    if validate:
+        from crm_tools.validate import check_rewrite
+
+        check = check_rewrite(path, after)
+        if check.status == ERROR:
+            return check
+    return result._replace(staged=None, diff=unified_diff(path, before, after))
+
+
+def run_or_preview(tasks, args, profile=None):
+    """Run `tasks` for a script, or preview them when args.diff is set.
+
+    Returns the results in task order either way. Previewed results carry
+    no staged files, so validate_results and commit_results leave the tree
+    alone.
+    """
+    budget = getattr(args, 'time_budget', None)
+    if not getattr(args, 'diff', None):
+        return run_tasks(tasks, args.jobs, budget, profile)
+
+    validate = getattr(args, 'validate', True)
+    previews = [(preview_file, task[1], task[0], tuple(task[2:]), validate) for task in tasks]
+    out = sys.stdout if args.diff == '-' else open(args.diff, 'w', encoding='utf-8', newline='')
+    results = []
+    try:
+        for result in iter_tasks(previews, args.jobs, budget, profile):
+            if result.diff:
+                out.write(result.diff)
+                result = result._replace(diff=None)
+            results.append(result)
+    finally:
+        if out is sys.stdout:
+            out.flush()
+        else:
+            out.close()
+    return results
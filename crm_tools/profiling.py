@@ -0,0 +1,126 @@
+"""
+Opt-in per-rule profiling for the fixers.
+
+With --profile, every rewrite rule records its wall time, match count and
+the number of bytes it rewrote, per file. Workers collect records while a
+file is processed and send them back with the result; the parent merges
+them into one `Report` that prints a sorted summary and can be dumped as
+JSON or CSV.
+
+When profiling is on, PROPERTY_MAP rules run one at a time instead of as a
+single alternation so each rule can be timed on its own. The output is the
+same either way; only the timing differs.
+"""
+
+import csv
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_records = None
+_path = None
+
+FIELDS = ['rule', 'path', 'seconds', 'matches', 'bytes_changed']
+
+
+def enabled():
+    return _records is not None
+
+
+@contextmanager
+def collecting(path):
+    """Collect records for the work done on `path` inside the block"""
+    global _records, _path
+    previous = _records, _path
+    _records, _path = [], path
+    try:
+        yield _records
+    finally:
+        _records, _path = previous
+
+
+def record(rule, seconds, matches, bytes_changed):
+    if _records is not None:
+        _records.append((rule, _path, seconds, matches, bytes_changed))
+
+
+@contextmanager
+def timed(rule):
+    """Time a block as `rule`; the block fills in matches and bytes_changed"""
+    if _records is None:
+        yield {}
+        return
+    stats = {'matches': 0, 'bytes_changed': 0}
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        record(rule, time.perf_counter() - start, stats['matches'], stats['bytes_changed'])
+
+
+class Report:
+    """Profiling records merged from every file of a run"""
+
+    def __init__(self):
+        self.records = []
+
+    def extend(self, records):
+        self.records.extend(records)
+
+    def by(self, column):
+        """Totals keyed by 'rule' or 'path': [seconds, matches, bytes_changed, calls]"""
+        key = FIELDS.index(column)
+        totals = defaultdict(lambda: [0.0, 0, 0, 0])
+        for row in self.records:
+            total = totals[row[key]]
+            total[0] += row[2]
+            total[1] += row[3]
+            total[2] += row[4]
+            total[3] += 1
+        return sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+
+    def print_summary(self, top=20):
+        for column, title in (('rule', 'Rule'), ('path', 'File')):
+            rows = self.by(column)
+            print(f'\n{title:<60}{"ms":>10}{"matches":>10}{"bytes":>10}{"calls":>8}')
+            for name, (seconds, matches, changed, calls) in rows[:top]:
+                print(f'{str(name)[-60:]:<60}{seconds * 1000:>10.3f}{matches:>10}{changed:>10}{calls:>8}')
+            if len(rows) > top:
+                print(f'... {len(rows) - top} more')
+        dead = [name for name, (_, matches, _, _) in self.by('rule') if matches == 0]
+        if dead:
+            shown = ', '.join(sorted(dead)[:top])
+            more = f' ... {len(dead) - top} more' if len(dead) > top else ''
+            print(f'\n{len(dead)} rules never matched: {shown}{more}')
+
+    def dump(self, path):
+        """Write every record to `path` as CSV (for .csv) or JSON"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if path.endswith('.csv'):
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(self.records)
+            else:
+                json.dump([dict(zip(FIELDS, row)) for row in self.records], f, indent=2)
+                f.write('\n')
+
+
+def add_profile_arguments(parser):
+    """Add the shared --profile and --profile-out options to an argparse parser"""
+    parser.add_argument('--profile', action='store_true', help='record time, matches and bytes per rule and file')
+    parser.add_argument('--profile-out', metavar='FILE', help='also dump the records as JSON, or CSV for *.csv')
+
+
+def report_for(args):
+    """A fresh Report when profiling was requested, else None"""
+    return Report() if args.profile or args.profile_out else None
+
+
+def finish(report, args):
+    if report is None:
+        return
+    report.print_summary()
+    if args.profile_out:
+        report.dump(args.profile_out)
+        print(f'[OK] Profile written to {args.profile_out}')
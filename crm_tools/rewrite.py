@@ -0,0 +1,306 @@
+"""
+PROPERTY_MAP rewrite engine.
+
+The backend returns camelCase fields while older generated pages read
+snake_case ones. Each page context (`var.`, `itemData.`, `accessorKey: '`,
+`row.original.`) is compiled into one ordered alternation so a page is
+rewritten in a single linear pass. Very large pages can be rewritten as a
+stream of chunks instead (`Rewriter.stream`), with the same result.
+"""
+
+import mmap
+import os
+import re
+import time
+from functools import lru_cache
+
+from crm_tools import profiling
+
+# Property mapping; `python -m crm_tools.schema check` compares it with the latest dump
+PROPERTY_MAP = {
+    'site_name': 'siteName', 'supplier_id': 'supplierId', 'city_id': 'cityId',
+    'adult_price': 'adultPrice', 'child_price': 'childPrice', 'student_price': 'studentPrice',
+    'senior_price': 'seniorPrice', 'opening_hours': 'openingHours', 'best_visit_time': 'bestVisitTime',
+    'picture_url': 'pictureUrl', 'is_active': 'isActive', 'guide_name': 'guideName',
+    'phone_number': 'phoneNumber', 'daily_rate': 'dailyRate', 'hotel_name': 'hotelName',
+    'star_rating': 'starRating', 'contact_person': 'contactPerson', 'contact_email': 'contactEmail',
+    'contact_phone': 'contactPhone', 'restaurant_name': 'restaurantName', 'cuisine_type': 'cuisineType',
+    'supplier_name': 'supplierName', 'supplier_type': 'supplierType', 'company_name': 'companyName',
+    'tax_number': 'taxNumber', 'tax_office': 'taxOffice', 'from_city_id': 'fromCityId',
+    'to_city_id': 'toCityId', 'base_price': 'basePrice', 'vehicle_type': 'vehicleType',
+    'rental_company_id': 'rentalCompanyId', 'model_name': 'modelName', 'type_name': 'typeName',
+    'max_capacity': 'maxCapacity', 'extra_name': 'extraName', 'extra_type': 'extraType',
+    'unit_price': 'unitPrice', 'description': 'description', 'email': 'email', 'address': 'address',
+    'website': 'website', 'notes': 'notes', 'currency': 'currency'
+}
+
+VAR_PATTERN = re.compile(r'const \{ data: (\w+), isLoading \} = use\w+\(')
+
+# Pages at least this big are rewritten in chunks of STREAM_CHUNK characters
+# where the rewrite allows it (see Rewriter.stream), instead of whole
+STREAM_THRESHOLD = 8 << 20
+STREAM_CHUNK = 1 << 20
+
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+
+class NeedsWholeFile(Exception):
+    """A streamed rewrite cannot be sure to match the whole-file result"""
+
+
+class _Overlap(Exception):
+    """A match touches the next prefix occurrence; only sequential subs rewrite it right"""
+
+
+def _single_pass_safe(rules):
+    """Check that an ordered alternation of `rules` rewrites exactly like
+    running one re.sub per rule in order.
+
+    That only breaks when a rule's output can be matched again by a later
+    rule (or the other way round), so any such overlap forces the slow path.
+    """
+    for i, (_, tail) in enumerate(rules):
+        for later, _ in rules[i + 1:]:
+            if later.startswith(tail) or tail.startswith(later):
+                return False
+    return True
+
+
+def _prefix_hazards(contexts):
+    """Check where a context prefix can overlap the text of a rule.
+
+    Returns None when a prefix can occur whole inside some rule's text
+    (e.g. var `city` in `city.city.city_name`): sequential subs then see
+    matches the alternation skips. Otherwise returns the remainders
+    `prefix[cut:]` of every rule text ending in `prefix[:cut]`; a match
+    followed by one of them overlaps the next occurrence, so the rewrite
+    checks for them at run time.
+    """
+    texts = [
+        (i, context[0] + text)
+        for i, context in enumerate(contexts) for key, tail in context[1] for text in (key, tail)
+    ]
+    hazards = set()
+    for i, context in enumerate(contexts):
+        prefix = context[0]
+        for j, text in texts:
+            if text.find(prefix, 1 if j == i else 0) != -1:
+                return None
+            for cut in range(1, len(prefix)):
+                if text.endswith(prefix[:cut]):
+                    hazards.add(prefix[cut:])
+    return tuple(sorted(hazards))
+
+
+def _build(contexts):
+    """Compile rewrite contexts into (pattern, lookups, sequential rules, per-rule list, hazards).
+
+    `sequential` is one (pattern, replacement) per rule, in order: the rewrite
+    the alternation reproduces, used instead of it when `pattern` is None
+    because the contexts cannot be rewritten in one pass.
+    """
+    branches = []
+    lookups = []
+    # (rule name, pattern, replacement, bytes rewritten per match) for --profile
+    per_rule = []
+    for context in contexts:
+        prefix, rules = context[:2]
+        label = context[2] if len(context) > 2 else prefix
+        for key, tail in rules:
+            per_rule.append((
+                label + key, re.escape(prefix + key), prefix + tail,
+                0 if key == tail else len(prefix + key),
+            ))
+        table = {}
+        for key, tail in rules:
+            table.setdefault(key, prefix + tail)
+        branches.append(re.escape(prefix) + '(' + '|'.join(re.escape(key) for key, _ in rules) + ')')
+        lookups.append(table)
+
+    sequential = [(re.compile(rule), replacement) for _, rule, replacement, _ in per_rule]
+    hazards = _prefix_hazards(contexts)
+    if hazards is None or not all(_single_pass_safe(context[1]) for context in contexts):
+        return None, [], sequential, per_rule, ()
+    pattern = re.compile('|'.join(branches)) if branches else None
+    return pattern, lookups, sequential, per_rule, hazards
+
+
+class Rewriter:
+    """A compiled set of rewrite contexts; call it on a page's text.
+
+    `stream(chunks)` rewrites text that arrives in pieces (see there).
+    """
+
+    def __init__(self, contexts):
+        self.contexts = contexts
+        self._compiled = None
+
+    def compiled(self):
+        # Built on first use, so modules can create rewriters at import time for free
+        if self._compiled is None:
+            self._compiled = _build(self.contexts)
+        return self._compiled
+
+    def _replace(self, match):
+        _, lookups, _, _, hazards = self.compiled()
+        if hazards and match.string.startswith(hazards, match.end()):
+            raise _Overlap
+        group = match.lastindex
+        return lookups[group - 1][match.group(group)]
+
+    def _passes(self, sequential=False):
+        pattern, _, rules, _, _ = self.compiled()
+        if pattern is not None and not sequential:
+            return [(pattern, self._replace)]
+        return [(rule, lambda _m, r=replacement: r) for rule, replacement in rules]
+
+    def longest(self):
+        """Length of the longest text any rule matches"""
+        return max((len(prefix) + len(key) for prefix, rules, *_ in self.contexts for key, _ in rules), default=1)
+
+    def __call__(self, content):
+        if profiling.enabled():
+            return self._rewrite_profiled(content)
+        try:
+            return _apply(self._passes(), content)
+        except _Overlap:
+            return _apply(self._passes(sequential=True), content)
+
+    def _rewrite_profiled(self, content):
+        # Rule by rule, which is what the alternation reproduces (see _build)
+        for name, rule, replacement, width in self.compiled()[3]:
+            start = time.perf_counter()
+            content, matches = re.subn(rule, lambda _m, r=replacement: r, content)
+            profiling.record(name, time.perf_counter() - start, matches, matches * width)
+        return content
+
+    def stream(self, chunks):
+        """Rewrite text arriving as an iterable of chunks; yields the output in pieces.
+
+        The result joins to exactly `self(''.join(chunks))`: every rule is a
+        literal, so a match starting at some offset is decided by the
+        `longest()` characters from there, and only that window minus one is
+        carried into the next chunk (plus enough to see a following
+        prefix). Each pass of the rewrite streams into the next, so memory
+        stays bounded by the chunk size.
+
+        Raises NeedsWholeFile when a match runs into the next prefix
+        occurrence, which only the whole-text rewrite handles.
+        """
+        window = self.longest() + max(map(len, self.compiled()[4]), default=0)
+        for rule, replacement in self._passes():
+            chunks = _stream_sub(rule, replacement, chunks, window)
+        return _overlap_needs_whole_file(chunks)
+
+
+def _apply(passes, content):
+    for rule, replacement in passes:
+        content = rule.sub(replacement, content)
+    return content
+
+
+def _overlap_needs_whole_file(chunks):
+    try:
+        yield from chunks
+    except _Overlap:
+        raise NeedsWholeFile from None
+
+
+def _stream_sub(pattern, replacement, chunks, window):
+    """pattern.sub over chunked text, for literal patterns at most `window` long"""
+    carry = ''
+    for chunk in chunks:
+        buffer = carry + chunk
+        # Matches starting before `limit` have their whole window in the buffer
+        limit = len(buffer) - window + 1
+        if limit <= 0:
+            carry = buffer
+            continue
+        out = []
+        pos = 0
+        for match in pattern.finditer(buffer):
+            if match.start() >= limit:
+                break
+            out.append(buffer[pos:match.start()])
+            out.append(replacement(match))
+            pos = match.end()
+        resume = max(pos, limit)
+        out.append(buffer[pos:resume])
+        carry = buffer[resume:]
+        yield ''.join(out)
+    if carry:
+        yield pattern.sub(replacement, carry)
+
+
+def compile_rewriter(contexts):
+    """Compile rewrite contexts into a single-pass `str -> str` Rewriter.
+
+    Each context is `(prefix, rules)` or `(prefix, rules, label)` where
+    `rules` is an ordered list of `(key, tail)`: every `prefix + key` becomes
+    `prefix + tail`. All contexts are joined into one alternation so a page
+    is scanned once, no matter how many keys the map holds. `label` replaces
+    the prefix in profiling rule names.
+
+    The alternation is compiled on the first call, so modules can build
+    rewriters at import time for free.
+    """
+    return Rewriter(contexts)
+
+
+def iter_text(path, chunk_size=STREAM_CHUNK):
+    """Read a page as text in chunks, with the same newline handling as open().read()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def search_file(pattern, path):
+    """First match of a str `pattern` in the file at `path`, without reading it whole.
+
+    Searches an mmap of the bytes with the pattern recompiled for bytes.
+    Returns `[match text, group 1, ...]`, None when there is no match, or
+    raises NeedsWholeFile when non-ASCII text ahead of that point could make
+    the str pattern match differently (`\\w` and `\\s` are Unicode-aware on str).
+    """
+    binary = _binary_pattern(pattern.pattern, pattern.flags & ~re.UNICODE)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            match = binary.search(data)
+            end = match.end() if match else len(data)
+            if _NON_ASCII.search(data, 0, end):
+                raise NeedsWholeFile(path)
+            if match is None:
+                return None
+            return [g.decode('ascii') if g is not None else None for g in (match.group(0),) + match.groups()]
+
+
+@lru_cache(maxsize=64)
+def _binary_pattern(source, flags):
+    return re.compile(source.encode('utf-8'), flags)
+
+
+@lru_cache(maxsize=256)
+def view_rewriter(var_name):
+    rules = [(snake, f'data.{camel}') for snake, camel in PROPERTY_MAP.items()]
+    rules.append(('city.city_name', 'data.city?.cityName'))
+    return compile_rewriter([(f'{var_name}.', rules, '<var>.')])
+
+
+@lru_cache(maxsize=256)
+def edit_if_pattern(var_name):
+    return re.compile(rf'if \({var_name}\) \{{\s*const formData = \{{')
+
+
+rewrite_item_data = compile_rewriter([
+    ('itemData.', list(PROPERTY_MAP.items())),
+])
+
+rewrite_list_columns = compile_rewriter([
+    ("accessorKey: '", [(f"{snake}'", f"{camel}'") for snake, camel in PROPERTY_MAP.items()]),
+    ('row.original.', list(PROPERTY_MAP.items())),
+])
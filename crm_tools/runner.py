@@ -0,0 +1,137 @@
+"""
+Parallel runner for the per-file codemod scripts.
+
+Each script describes its work as a list of tasks `(func, path, *args)`.
+`func` must be a module-level function returning a `FileResult` so it can be
+pickled into a worker process. Results always come back in task order, so
+output is identical whether a run used one job or many.
+
+Tasks do not write pages themselves: they stage the new text with
+`crm_tools.atomic.stage` and return the temp path in `FileResult.staged`;
+the script commits all of them at the end with `atomic.commit_results`.
+"""
+
+import os
+from collections import deque, namedtuple
+from functools import partial
+
+from crm_tools import profiling
+from crm_tools.budget import BudgetExceeded, time_budget
+
+FIXED = 'fixed'
+SKIPPED = 'skipped'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+
+# Tasks each worker may have queued or finished-but-unread in iter_tasks
+IN_FLIGHT = 4
+
+# `diff` is only set by --diff previews (see crm_tools.preview)
+FileResult = namedtuple('FileResult', ['path', 'status', 'message', 'staged', 'diff'], defaults=[None, None])
+
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs option to an argparse parser"""
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='number of worker processes (0 = one per CPU, default: 1)',
+    )
+
+
+def add_budget_argument(parser):
+    """Add the shared --time-budget option to an argparse parser"""
+    parser.add_argument(
+        '--time-budget', type=float, default=None, metavar='SECONDS',
+        help='skip and report any file that takes longer than this to process',
+    )
+
+
+def resolve_jobs(jobs):
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def run_task(task, budget=None, profile=False):
+    """Run a single task, turning exceptions into an error result.
+
+    With `profile`, returns `(result, records)` with the profiling records
+    collected while the task ran.
+    """
+    if profile:
+        with profiling.collecting(task[1]) as records:
+            result = run_task(task, budget)
+        return result, records
+
+    func, path, *args = task
+    try:
+        with time_budget(budget):
+            return func(path, *args)
+    except BudgetExceeded:
+        return FileResult(path, TIMEOUT, f'[TIMEOUT] {path}: over the {budget:g}s budget, skipped')
+    except Exception as e:
+        return FileResult(path, ERROR, f'[ERROR] {path}: {type(e).__name__}: {e}')
+
+
+def run_tasks(tasks, jobs=1, budget=None, profile=None):
+    """Run tasks serially or in a process pool and return results in task order.
+
+    `profile` is an optional `profiling.Report` that receives the records
+    from every task.
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks)) if tasks else 1
+    call = partial(run_task, budget=budget, profile=profile is not None)
+    if jobs <= 1:
+        results = [call(task) for task in tasks]
+    else:
+        # Imported here: the pool machinery is a large share of start-up time
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(call, tasks, chunksize=chunksize))
+
+    if profile is None:
+        return results
+    for _, records in results:
+        profile.extend(records)
+    return [result for result, _ in results]
+
+
+def iter_tasks(tasks, jobs=1, budget=None, profile=None):
+    """Like run_tasks, but yield each result in task order as soon as it is ready.
+
+    Only `IN_FLIGHT` tasks per worker are submitted ahead of the consumer,
+    so results that are streamed out and dropped never pile up in memory.
+    """
+    tasks = list(tasks)
+    jobs = min(resolve_jobs(jobs), len(tasks)) if tasks else 1
+    call = partial(run_task, budget=budget, profile=profile is not None)
+
+    def unpack(result):
+        if profile is None:
+            return result
+        result, records = result
+        profile.extend(records)
+        return result
+
+    if jobs <= 1:
+        for task in tasks:
+            yield unpack(call(task))
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(call, task))
+            if len(pending) >= jobs * IN_FLIGHT:
+                yield unpack(pending.popleft().result())
+        while pending:
+            yield unpack(pending.popleft().result())
+
+
+def count_errors(results):
+    """Number of results that failed or ran over their time budget"""
+    return sum(1 for result in results if result.status in (ERROR, TIMEOUT))
@@ -0,0 +1,191 @@
+"""
+Column catalogue from the backend's SQL backups, read as a stream.
+
+The backups in backend/database/ describe every table with comment headers:
+
+    -- Table: guides
+    -- Columns: id, operator_id, guide_name, ...
+    -- Total rows: 12
+
+followed by one single-row `INSERT INTO guides (...) VALUES (...);` per line.
+`iter_tables` reads a dump line by line in binary and only decodes those
+headers, so memory use stays flat no matter how large the dump is. INSERT
+lines are only parsed for their column list when a table has no
+`-- Columns:` header.
+
+From the catalogue this derives the snake_case -> camelCase PROPERTY_MAP
+and the per-module field lists that are otherwise kept by hand.
+
+Usage:
+    python -m crm_tools.schema [--dump FILE] [--table MODULE=TABLE]
+                               {property-map,modules,check}
+"""
+
+import argparse
+import glob
+import os
+import pprint
+import re
+import sys
+from collections import namedtuple
+
+from crm_tools.changes import literal_in
+
+DUMP_GLOB = 'backend/database/*.sql'
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generate_services_pages.py')
+
+# Bookkeeping columns every table has; pages never show them as fields
+SYSTEM_COLUMNS = frozenset(['id', 'operator_id', 'created_at', 'updated_at', 'deleted_at'])
+
+Table = namedtuple('Table', ['name', 'columns', 'rows'])
+
+INSERT_HEAD = re.compile(rb'INSERT INTO "?(\w+)"? \(([^)]*)\)')
+
+
+def _split_columns(text):
+    return [column.strip().strip('"`') for column in text.split(',') if column.strip()]
+
+
+def iter_tables(path):
+    """Yield a Table for every table section of the dump at `path`, in file order"""
+    name = columns = rows = None
+    inserts = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(b'-- '):
+                if line.startswith(b'-- Table: '):
+                    if name is not None:
+                        yield Table(name, columns or [], inserts if rows is None else rows)
+                    name = line[10:].decode('utf-8').strip()
+                    columns = rows = None
+                    inserts = 0
+                elif line.startswith(b'-- Columns: ') and name is not None:
+                    columns = _split_columns(line[12:].decode('utf-8'))
+                elif line.startswith(b'-- Total rows: ') and name is not None:
+                    rows = int(line[15:].strip() or 0)
+            elif line.startswith(b'INSERT INTO ') and name is not None:
+                inserts += 1
+                if columns is None:
+                    match = INSERT_HEAD.match(line)
+                    if match and match.group(1).decode('utf-8') == name:
+                        columns = _split_columns(match.group(2).decode('utf-8'))
+    if name is not None:
+        yield Table(name, columns or [], inserts if rows is None else rows)
+
+
+def load_catalogue(path):
+    """Map of table name -> column list for a dump"""
+    return {table.name: table.columns for table in iter_tables(path)}
+
+
+def latest_dump(pattern=DUMP_GLOB):
+    """Newest dump matching `pattern` (backup names sort by timestamp), or None"""
+    dumps = sorted(glob.glob(pattern))
+    return dumps[-1] if dumps else None
+
+
+def camel(snake):
+    """'best_visit_time' -> 'bestVisitTime'"""
+    head, *rest = snake.split('_')
+    return head + ''.join(part[:1].upper() + part[1:] for part in rest)
+
+
+def field_columns(columns):
+    return [column for column in columns if column not in SYSTEM_COLUMNS]
+
+
+def module_tables(modules, catalogue, overrides=None):
+    """Module key -> table name, by `-` -> `_` or an explicit override"""
+    overrides = overrides or {}
+    tables = {}
+    for module_key in modules:
+        table = overrides.get(module_key, module_key.replace('-', '_'))
+        if table in catalogue:
+            tables[module_key] = table
+    return tables
+
+
+def property_map(catalogue, tables):
+    """snake_case -> camelCase for every field column of `tables`, first seen first"""
+    mapping = {}
+    for table in tables:
+        for column in field_columns(catalogue[table]):
+            mapping.setdefault(column, camel(column))
+    return mapping
+
+
+def module_fields(catalogue, tables):
+    """Module key -> field columns of its table"""
+    return {module_key: field_columns(catalogue[table]) for module_key, table in tables.items()}
+
+
+def config_fields(config):
+    """Every field a MODULES entry refers to"""
+    fields = [config.get('key_field')] + list(config.get('list_columns', []))
+    for section in config.get('form_sections', []):
+        fields.extend(section.get('fields', []))
+    return [field for field in dict.fromkeys(fields) if field]
+
+
+def load_modules(path=GENERATOR):
+    """MODULES from the page generator, read without running it"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return literal_in(f.read(), 'MODULES') or {}
+
+
+def check(catalogue, modules, tables, current_map):
+    """Problems found comparing the hand-kept inputs with the dump, as messages"""
+    problems = []
+    for module_key in modules:
+        if module_key not in tables:
+            problems.append(f'[WARN] {module_key}: no table in the dump (use --table {module_key}=TABLE)')
+    derived = property_map(catalogue, tables.values())
+    for snake in derived:
+        if '_' in snake and snake not in current_map:
+            problems.append(f'[MISSING] PROPERTY_MAP lacks {snake!r}: {derived[snake]!r}')
+    for snake, camel_name in current_map.items():
+        if snake in derived and derived[snake] != camel_name:
+            problems.append(f'[DIFF] PROPERTY_MAP[{snake!r}] is {camel_name!r}, expected {derived[snake]!r}')
+    for module_key, table in tables.items():
+        columns = set(catalogue[table])
+        for field in config_fields(modules[module_key]):
+            if field not in columns and f'{field}_id' not in columns:
+                problems.append(f'[UNKNOWN] {module_key}: field {field!r} is not a column of {table}')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Derive PROPERTY_MAP and module fields from a schema dump')
+    parser.add_argument('command', choices=['property-map', 'modules', 'check'])
+    parser.add_argument('--dump', help=f'SQL backup to read (default: newest {DUMP_GLOB})')
+    parser.add_argument(
+        '--table', action='append', default=[], metavar='MODULE=TABLE',
+        help='table for a module whose name does not match (repeatable)',
+    )
+    args = parser.parse_args(argv)
+
+    dump = args.dump or latest_dump()
+    if dump is None:
+        parser.error(f'no dump found matching {DUMP_GLOB}')
+    overrides = dict(item.split('=', 1) for item in args.table)
+
+    catalogue = load_catalogue(dump)
+    modules = load_modules()
+    tables = module_tables(modules, catalogue, overrides)
+
+    if args.command == 'property-map':
+        print('PROPERTY_MAP = ' + pprint.pformat(property_map(catalogue, tables.values()), sort_dicts=False))
+    elif args.command == 'modules':
+        print('MODULE_FIELDS = ' + pprint.pformat(module_fields(catalogue, tables), sort_dicts=False))
+    else:
+        from crm_tools.rewrite import PROPERTY_MAP
+        problems = check(catalogue, modules, tables, PROPERTY_MAP)
+        for problem in problems:
+            print(problem)
+        print(f'[DONE] {len(catalogue)} tables, {len(tables)} modules matched, {len(problems)} problems')
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
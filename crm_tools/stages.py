@@ -0,0 +1,41 @@
+"""
+Registry of codemod transform stages.
+
+A stage is a pure `str -> str` function registered for one or more page
+kinds ('list', 'edit', 'view'). Stages run in ascending `order`, so the
+pipeline applies them the same way on every file.
+
+`tokens` lists the literal strings (or compiled patterns) a stage needs to
+see before it can change a page; crm_tools.prefilter uses them to skip
+files early. A stage without tokens is assumed to touch any file.
+"""
+
+from collections import namedtuple
+
+Stage = namedtuple('Stage', ['name', 'order', 'kinds', 'transform', 'tokens'])
+
+STAGES = []
+
+
+def stage(name, order, kinds, tokens=None):
+    """Register the decorated function as a transform stage"""
+    def decorator(transform):
+        STAGES.append(Stage(name, order, tuple(kinds), transform, None if tokens is None else tuple(tokens)))
+        return transform
+    return decorator
+
+
+def stages_for(kind, names=None):
+    """Registered stages for a page kind, in run order"""
+    selected = [s for s in STAGES if kind in s.kinds and (names is None or s.name in names)]
+    return sorted(selected, key=lambda s: s.order)
+
+
+def tokens_for(kind, names=None):
+    """Union of the tokens of the selected stages, or None if one has no tokens"""
+    tokens = set()
+    for current in stages_for(kind, names):
+        if current.tokens is None:
+            return None
+        tokens.update(current.tokens)
+    return tokens
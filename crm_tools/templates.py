@@ -0,0 +1,53 @@
+"""
+Precompiled page templates.
+
+Templates are plain TSX with `{% name %}` slots, a syntax that cannot clash
+with JSX braces. `compile_template` parses a template once into alternating
+literal chunks and slot references; rendering fills the slots from a context
+dict and joins the parts in one go.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+
+SLOT = re.compile(r'\{%\s*(\w+)\s*%\}')
+
+
+class Template:
+    """A template parsed into literal chunks and slot positions"""
+
+    def __init__(self, source):
+        self.source = source
+        self.fingerprint = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+        self._parts = []
+        self._slots = []
+        last = 0
+        for match in SLOT.finditer(source):
+            self._parts.append(source[last:match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append(None)
+            last = match.end()
+        self._parts.append(source[last:])
+        self.slots = frozenset(name for _, name in self._slots)
+
+    def render(self, context):
+        parts = self._parts[:]
+        for position, name in self._slots:
+            parts[position] = context[name]
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=64)
+def compile_template(source):
+    """Parse `source` into a Template, reusing recent parses of the same text.
+
+    The cache is bounded: watch mode recompiles every edited template, and
+    the stale versions must not pile up.
+    """
+    return Template(source)
+
+
+def pascal(text):
+    """'Entrance Fee' -> 'EntranceFee'"""
+    return text.replace(' ', '')
@@ -0,0 +1,174 @@
+"""
+Pure `str -> str` page transforms shared by the fix scripts and the pipeline.
+
+Each function takes the full text of a page and returns the rewritten text,
+or the same text when it has nothing to do.
+"""
+
+import re
+
+from crm_tools import profiling
+from crm_tools.jsx import find_elements
+from crm_tools.rewrite import (
+    PROPERTY_MAP, VAR_PATTERN, edit_if_pattern, iter_text, rewrite_item_data, rewrite_list_columns,
+    search_file, view_rewriter,
+)
+from crm_tools.stages import stage
+from crm_tools.tsx_index import index_for
+
+DELETE_BUTTON_INLINE = '<Button variant="ghost" size="sm" onClick={() => { if (confirm("Are you sure?")) deleteItem(row.original.id); }} disabled={isDeleting}><Trash2 className="h-4 w-4 text-red-600" /></Button>'
+
+DELETE_BUTTON = '''<Button
+            variant="ghost"
+            size="sm"
+            disabled={isDeleting}
+            onClick={() => {
+              if (confirm('Are you sure?')) deleteItem(row.original.id);
+            }}
+          >
+            <Trash2 className="h-4 w-4 text-red-600" />
+          </Button>'''
+
+# Prefilter tokens: a page without any of these cannot be changed by the stage.
+# Keys that map to themselves (e.g. 'currency') rewrite nothing and are left out.
+_RENAMED = [snake for snake, camel in PROPERTY_MAP.items() if snake != camel]
+# View rewrites turn `<var>.key` into `<var>.data.key`, so only count keys not
+# already behind `.data` (plus the odd page whose variable is called `data`).
+VIEW_TOKENS = [
+    re.compile(r'(?<!\.data)\.(?:%s)' % '|'.join(re.escape(key) for key in [*PROPERTY_MAP, 'city.city_name'])),
+    'const { data: data,',
+]
+EDIT_TOKENS = [f'itemData.{snake}' for snake in _RENAMED] + [
+    re.compile(r'if \(\w+\) \{\s*const formData = \{'),
+]
+LIST_TOKENS = [f"accessorKey: '{snake}'" for snake in _RENAMED] + [
+    f'row.original.{snake}' for snake in _RENAMED
+]
+
+
+@stage('view-properties', 30, ['view'], VIEW_TOKENS)
+def fix_view_content(content):
+    """Point detail pages at `<var>.data.<camelCase>`"""
+    var_match = VAR_PATTERN.search(content)
+    if not var_match:
+        return content
+    return view_rewriter(var_match.group(1))(content)
+
+
+@stage('edit-properties', 30, ['edit'], EDIT_TOKENS)
+def fix_edit_content(content):
+    """Unwrap `<var>.data` into itemData and read camelCase fields from it"""
+    var_match = VAR_PATTERN.search(content)
+    if not var_match:
+        return content
+
+    var_name = var_match.group(1)
+    with profiling.timed('edit-if') as stats:
+        content, matches = edit_if_pattern(var_name).subn(
+            lambda _m: f'if ({var_name}?.data) {{\n      const itemData = {var_name}.data;\n      const formData = {{',
+            content
+        )
+        stats['matches'] = matches
+    return rewrite_item_data(content)
+
+
+@stage('list-properties', 30, ['list'], LIST_TOKENS)
+def fix_list_content(content):
+    """Use camelCase accessorKeys and row.original fields in list columns"""
+    return rewrite_list_columns(content)
+
+
+def stream_view_file(path):
+    """fix_view_content for a file too big to read whole: output chunks, or None
+    when the page has no data variable. May raise rewrite.NeedsWholeFile."""
+    var_match = search_file(VAR_PATTERN, path)
+    if var_match is None:
+        return None
+    return view_rewriter(var_match[1]).stream(iter_text(path))
+
+
+def stream_list_file(path):
+    """fix_list_content for a file too big to read whole, as output chunks"""
+    return rewrite_list_columns.stream(iter_text(path))
+
+
+@stage('confirm-dialog', 10, ['list'], ['ConfirmDialog'])
+def remove_confirm_dialog(content):
+    """Replace ConfirmDialog delete triggers with a plain confirm() button"""
+    with profiling.timed('confirm-dialog') as stats:
+        new_content = _remove_confirm_dialog(content)
+        stats['matches'] = new_content.count(DELETE_BUTTON_INLINE) - content.count(DELETE_BUTTON_INLINE)
+        stats['bytes_changed'] = abs(len(content) - len(new_content))
+    return new_content
+
+
+def _remove_confirm_dialog(content):
+    # Remove ConfirmDialog import
+    content = re.sub(r',\s*ConfirmDialog\s*', '', content)
+    content = re.sub(r'ConfirmDialog,\s*', '', content)
+
+    # Replace self-closing <ConfirmDialog ... trigger={...} /> with a simple Button
+    chunks = []
+    last = 0
+    if '<ConfirmDialog' not in content:
+        return content
+    index = index_for(content)
+    for start, end, attrs, self_closing in find_elements(content, 'ConfirmDialog', index):
+        if self_closing and 'trigger' in attrs:
+            chunks.append(content[last:start])
+            chunks.append(DELETE_BUTTON_INLINE)
+            last = end
+    if not chunks:
+        return content
+    chunks.append(content[last:])
+    return ''.join(chunks)
+
+
+def needs_actions_repair(content):
+    return 'title="Delete' in content and 'trigger={' in content
+
+
+def find_actions_column(content):
+    """Return the (start, end) span of the actions column object, or None"""
+    # Find the start of actions column
+    actions_start = content.find("id: 'actions'")
+    if actions_start == -1:
+        actions_start = content.find('id: "actions"')
+    if actions_start == -1:
+        return None
+
+    # The column is the innermost object literal around the id
+    span = index_for(content).enclosing(actions_start, 'object')
+    if span is None or span[1] is None:
+        return None
+    return span[0], span[1] + 1
+
+
+@stage('actions-column', 20, ['list'], ['title="Delete'])
+def repair_actions_column(content):
+    """Swap the half-removed ConfirmDialog in the actions column for a delete button"""
+    with profiling.timed('actions-column') as stats:
+        new_content = _repair_actions_column(content)
+        stats['matches'] = int(new_content != content)
+        stats['bytes_changed'] = abs(len(content) - len(new_content))
+    return new_content
+
+
+def _repair_actions_column(content):
+    if not needs_actions_repair(content):
+        return content
+    span = find_actions_column(content)
+    if span is None:
+        return content
+
+    column_start, column_end = span
+    new_column = content[column_start:column_end]
+    # Remove the broken ConfirmDialog part
+    # Find the broken part: from "title=" to the end of trigger block
+    broken_start = new_column.find('title="Delete')
+    if broken_start != -1:
+        # Find the end: the /> after the trigger Button
+        broken_end = new_column.find('/>', broken_start) + 2
+        new_column = new_column[:broken_start] + DELETE_BUTTON + new_column[broken_end:]
+
+    return content[:column_start] + new_column + content[column_end:]
@@ -0,0 +1,365 @@
+"""
+String- and JSX-aware token index for .tsx sources.
+
+`index_for(content)` scans a page once and records every `{}`, `()` and `[]`
+pair, skipping strings, template literals, comments, regex literals and JSX
+text (where an apostrophe is just text). The resulting `TokenIndex` answers
+"matching bracket of offset Y" in O(1) and "innermost enclosing object
+literal of offset X" in O(log n). Anything the scan cannot balance, including
+a JSX closing tag whose name does not match its opening tag, is listed in
+`problems`.
+
+Indexes are cached by content hash, so every fixer that looks at the same
+text during a run reuses one scan.
+"""
+
+import hashlib
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+
+from crm_tools.budget import check_budget
+
+CACHE_SIZE = 64
+
+_CODE_SPECIAL = re.compile(r'[{}()\[\]\'"`/<]')
+_CHILDREN_SPECIAL = re.compile(r'[<{]')
+_TEMPLATE_SPECIAL = re.compile(r'[`\\$]')
+_NAME = re.compile(r'[A-Za-z_$][\w$.:-]*')
+# `<T,>` or `<T extends X>` before an arrow function: a type parameter, not JSX
+_TYPE_PARAMETER = re.compile(r'\s*(?:,|extends\b)')
+
+_CLOSERS = {'}': '{', ')': '(', ']': '['}
+
+# Characters / words after which `<` starts JSX and `/` starts a regex
+_EXPRESSION_START_CHARS = set('(,=:?[{};&|!~+-*%^')
+_EXPRESSION_START_WORDS = {'return', 'yield', 'await', 'case', 'default', 'else', 'typeof', 'void', 'in', 'of'}
+
+# Characters after which `{` opens an object literal rather than a block
+_OBJECT_AFTER_CHARS = set('(,=:?[!&|')
+
+_cache = OrderedDict()
+
+
+class TokenIndex:
+    """Bracket spans of one source text.
+
+    `spans` holds (open, close, kind) triples in order of the opening
+    offset. Kinds are 'object', 'block', 'jsx' (a JSX expression container),
+    'template' (`${...}`), 'paren' and 'bracket'. `problems` lists
+    (offset, message) pairs for anything the scan could not balance.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.spans = []
+        self.problems = []
+        self._partner = {}
+        self._parent = []
+        self._object_ancestor = []
+        self._event_offsets = []
+        self._event_spans = []
+
+    def matching(self, offset):
+        """Offset of the bracket matching the one at `offset`, or None"""
+        return self._partner.get(offset)
+
+    def enclosing(self, offset, kind=None):
+        """(open, close) of the innermost span around `offset`, or None.
+
+        With kind='object' the innermost enclosing object literal is
+        returned instead of, say, a call's parentheses.
+        """
+        k = bisect_right(self._event_offsets, offset) - 1
+        if k < 0:
+            return None
+        span_id, is_open = self._event_spans[k]
+        if not is_open:
+            span_id = self._parent[span_id]
+        if span_id is not None and kind is not None:
+            if kind != 'object':
+                while span_id is not None and self.spans[span_id][2] != kind:
+                    span_id = self._parent[span_id]
+            else:
+                span_id = self._object_ancestor[span_id]
+        if span_id is None:
+            return None
+        start, end, _ = self.spans[span_id]
+        return start, end
+
+    def _finish(self, events):
+        """Build the lookup tables from (offset, span_id, is_open) events"""
+        self._parent = [None] * len(self.spans)
+        self._object_ancestor = [None] * len(self.spans)
+        stack = []
+        for offset, span_id, is_open in events:
+            if is_open:
+                parent = stack[-1] if stack else None
+                self._parent[span_id] = parent
+                if self.spans[span_id][2] == 'object':
+                    self._object_ancestor[span_id] = span_id
+                elif parent is not None:
+                    self._object_ancestor[span_id] = self._object_ancestor[parent]
+                stack.append(span_id)
+            else:
+                stack.pop()
+            self._event_offsets.append(offset)
+            self._event_spans.append((span_id, is_open))
+
+
+def _previous_token(text, i):
+    """Offset of the last significant character before i, and the word ending there"""
+    j = i - 1
+    while j >= 0 and text[j].isspace():
+        j -= 1
+    k = j
+    while k >= 0 and (text[k].isalnum() or text[k] in '_$'):
+        k -= 1
+    return j, text[k + 1:j + 1]
+
+
+def _starts_expression(text, i):
+    j, word = _previous_token(text, i)
+    if j < 0:
+        return True
+    if word:
+        return word in _EXPRESSION_START_WORDS
+    if text[j] == '>':
+        # Only the arrow of `=> <div />`, not the end of a generic type
+        return j > 0 and text[j - 1] == '='
+    return text[j] in _EXPRESSION_START_CHARS
+
+
+def _brace_kind(text, i):
+    j, word = _previous_token(text, i)
+    if word == 'return':
+        return 'object'
+    if j >= 0 and not word and text[j] in _OBJECT_AFTER_CHARS:
+        return 'object'
+    return 'block'
+
+
+def _skip_line_string(text, i):
+    quote = text[i]
+    n = len(text)
+    i += 1
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+        elif c == quote or c == '\n':
+            return i + 1
+        else:
+            i += 1
+    return n
+
+
+def _skip_regex(text, i):
+    n = len(text)
+    i += 1
+    in_class = False
+    while i < n:
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            return i + 1
+        i += 1
+    return n
+
+
+def build_index(text):
+    """Scan `text` once and return its TokenIndex (uncached)"""
+    index = TokenIndex(len(text))
+    n = len(text)
+    events = []
+    # Frames: ('code', open_offset, kind, span_char) for brackets,
+    # ('template', offset) for template literals, ('tag', closing, name, offset)
+    # inside a JSX tag, ('children', name, offset) between a JSX element's
+    # opening and closing tags.
+    stack = [('code', None, None, None)]
+    i = 0
+    steps = 0
+
+    def open_span(offset, char, kind):
+        span_id = len(index.spans)
+        index.spans.append([offset, None, kind])
+        events.append((offset, span_id, True))
+        stack.append(('code', offset, kind, char, span_id))
+
+    def close_span(offset):
+        frame = stack.pop()
+        span_id = frame[4]
+        index.spans[span_id][1] = offset
+        index._partner[frame[1]] = offset
+        index._partner[offset] = frame[1]
+        events.append((offset, span_id, False))
+
+    while i < n:
+        steps += 1
+        if steps & 0xFF == 0:
+            check_budget()
+
+        frame = stack[-1]
+        mode = frame[0]
+
+        if mode == 'template':
+            m = _TEMPLATE_SPECIAL.search(text, i)
+            if not m:
+                break
+            i = m.start()
+            c = text[i]
+            if c == '\\':
+                i += 2
+            elif c == '`':
+                stack.pop()
+                i += 1
+            elif text.startswith('${', i):
+                open_span(i + 1, '{', 'template')
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if mode == 'children':
+            m = _CHILDREN_SPECIAL.search(text, i)
+            if not m:
+                break
+            i = m.start()
+            if text[i] == '{':
+                open_span(i, '{', 'jsx')
+                i += 1
+            else:
+                start = i
+                closing = text.startswith('</', i)
+                i += 2 if closing else 1
+                name = _NAME.match(text, i)
+                if name:
+                    i = name.end()
+                stack.append(('tag', closing, name.group() if name else '', start))
+            continue
+
+        if mode == 'tag':
+            c = text[i]
+            if c.isspace():
+                i += 1
+            elif c == '{':
+                open_span(i, '{', 'jsx')
+                i += 1
+            elif c == '"' or c == "'":
+                end = text.find(c, i + 1)
+                if end == -1:
+                    index.problems.append((i, 'unterminated attribute string'))
+                    break
+                i = end + 1
+            elif text.startswith('/>', i):
+                stack.pop()
+                i += 2
+            elif c == '>':
+                _, closing, name, start = stack.pop()
+                if closing:
+                    if stack[-1][0] == 'children':
+                        opened = stack.pop()
+                        if opened[1] != name:
+                            index.problems.append(
+                                (start, f'closing tag </{name}> does not match <{opened[1]}> at offset {opened[2]}')
+                            )
+                else:
+                    stack.append(('children', name, start))
+                i += 1
+            else:
+                i += 1
+            continue
+
+        # Code mode
+        m = _CODE_SPECIAL.search(text, i)
+        if not m:
+            break
+        i = m.start()
+        c = text[i]
+        if c == '{':
+            open_span(i, '{', _brace_kind(text, i))
+            i += 1
+        elif c == '(':
+            open_span(i, '(', 'paren')
+            i += 1
+        elif c == '[':
+            open_span(i, '[', 'bracket')
+            i += 1
+        elif c in _CLOSERS:
+            if frame[1] is None or frame[3] != _CLOSERS[c]:
+                index.problems.append((i, f'unmatched {c!r}'))
+            else:
+                close_span(i)
+            i += 1
+        elif c == '"' or c == "'":
+            end = _skip_line_string(text, i)
+            if end >= n or text[end - 1] != c:
+                index.problems.append((i, 'unterminated string'))
+            i = end
+        elif c == '`':
+            stack.append(('template', i))
+            i += 1
+        elif text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = n if newline == -1 else newline + 1
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            if end == -1:
+                index.problems.append((i, 'unterminated comment'))
+                break
+            i = end + 2
+        elif c == '/':
+            i = _skip_regex(text, i) if _starts_expression(text, i) else i + 1
+        elif c == '<':
+            nxt = text[i + 1:i + 2]
+            if (nxt == '>' or nxt.isalpha()) and _starts_expression(text, i):
+                start = i
+                i += 1
+                name = _NAME.match(text, i)
+                if name:
+                    i = name.end()
+                    if _TYPE_PARAMETER.match(text, i):
+                        continue
+                stack.append(('tag', False, name.group() if name else '', start))
+            else:
+                i += 1
+        else:
+            i += 1
+
+    for frame in stack[1:]:
+        if frame[0] == 'code':
+            index.problems.append((frame[1], f'unclosed {frame[3]!r}'))
+        elif frame[0] == 'tag':
+            index.problems.append((frame[3], f'unterminated JSX tag <{frame[2]}'))
+        elif frame[0] == 'children':
+            index.problems.append((frame[2], f'unclosed JSX element <{frame[1]}>'))
+        else:
+            index.problems.append((frame[1], 'unterminated template literal'))
+    index._finish(events)
+    return index
+
+
+def content_key(content):
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+
+def index_for(content):
+    """Cached TokenIndex for `content`, keyed by its hash"""
+    key = content_key(content)
+    index = _cache.get(key)
+    if index is not None:
+        _cache.move_to_end(key)
+        return index
+    index = build_index(content)
+    _cache[key] = index
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return index
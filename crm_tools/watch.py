@@ -0,0 +1,159 @@
+"""
+Watch mode for the page generators.
+
+`watch(paths, rebuild)` blocks, waiting for any of `paths` to change, and
+calls `rebuild(changed_paths)` once the changes have been quiet for a short
+debounce window, so an editor's save-rename-chmod burst triggers a single
+rebuild. With the optional `inotify_simple` package the wait is event
+driven on Linux; otherwise the files are polled by mtime.
+
+The generators keep their parsed configs and compiled templates between
+rebuilds and use `load_script` to re-read their own source when it changes,
+so only the module pages whose inputs differ are rendered again.
+"""
+
+import importlib.util
+import os
+import time
+
+try:
+    import inotify_simple
+except ImportError:  # optional, polling fallback
+    inotify_simple = None
+
+DEFAULT_DEBOUNCE_MS = 30
+POLL_INTERVAL = 0.05
+
+
+def add_watch_arguments(parser):
+    """Add the shared --watch, --debounce and --poll options to an argparse parser"""
+    parser.add_argument('--watch', action='store_true', help='keep running and regenerate pages as sources change')
+    parser.add_argument(
+        '--debounce', type=int, default=DEFAULT_DEBOUNCE_MS, metavar='MS',
+        help=f'wait this long after the last change before rebuilding (default: {DEFAULT_DEBOUNCE_MS})',
+    )
+    parser.add_argument('--poll', action='store_true', help='poll file mtimes even when inotify is available')
+
+
+def load_script(path, name='_watched_script'):
+    """Execute a script file as a fresh module object and return it"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class PollingWatcher:
+    """Detect changes by comparing (mtime, size) of every watched file"""
+
+    def __init__(self, paths):
+        self.update(paths)
+
+    def update(self, paths):
+        self.stamps = {path: _stamp(path) for path in paths}
+
+    def wait(self, timeout=None):
+        """Changed paths, or an empty set once `timeout` seconds pass without any"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, old in self.stamps.items():
+                new = _stamp(path)
+                if new != old:
+                    self.stamps[path] = new
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return changed
+            time.sleep(POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Event-driven watcher on the directories that hold the watched files.
+
+    Directories are watched instead of files because editors usually save by
+    writing a new file and renaming it over the old one.
+    """
+
+    def __init__(self, paths):
+        self.inotify = inotify_simple.INotify()
+        flags = inotify_simple.flags
+        self.mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.CREATE | flags.DELETE
+        self.dirs = {}
+        self.update(paths)
+
+    def update(self, paths):
+        self.paths = {os.path.abspath(path) for path in paths}
+        wanted = {os.path.dirname(path) for path in self.paths}
+        for directory in wanted - set(self.dirs.values()):
+            if os.path.isdir(directory):
+                self.dirs[self.inotify.add_watch(directory, self.mask)] = directory
+        for wd, directory in list(self.dirs.items()):
+            if directory not in wanted or not os.path.isdir(directory):
+                try:
+                    self.inotify.rm_watch(wd)
+                except OSError:
+                    pass
+                del self.dirs[wd]
+        # Drop queued events, like the rebuild's own writes; the polling
+        # watcher forgets them the same way when it re-stamps
+        self.inotify.read(timeout=0)
+
+    def wait(self, timeout=None):
+        """Changed paths, or an empty set once `timeout` seconds pass without any"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, int((deadline - time.monotonic()) * 1000))
+            changed = set()
+            for event in self.inotify.read(timeout=remaining):
+                directory = self.dirs.get(event.wd)
+                if directory is not None and event.name:
+                    path = os.path.join(directory, event.name)
+                    if path in self.paths:
+                        changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        self.inotify.close()
+
+
+def watch(paths, rebuild, debounce_ms=DEFAULT_DEBOUNCE_MS, poll=False):
+    """Call `rebuild(changed)` after each debounced burst of changes; runs until interrupted.
+
+    `rebuild` may return a new collection of paths to watch.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    watcher = PollingWatcher(paths) if poll or inotify_simple is None else InotifyWatcher(paths)
+    print(f'[WATCH] Watching {len(paths)} files ({type(watcher).__name__}), Ctrl+C to stop')
+    try:
+        while True:
+            changed = watcher.wait()
+            while True:
+                more = watcher.wait(debounce_ms / 1000)
+                if not more:
+                    break
+                changed |= more
+            start = time.perf_counter()
+            new_paths = rebuild(changed)
+            if new_paths is not None:
+                paths = [os.path.abspath(path) for path in new_paths]
+            # Re-stamp/drain so the rebuild's own writes are not seen as changes
+            watcher.update(paths)
+            print(f'[WATCH] Rebuilt in {(time.perf_counter() - start) * 1000:.1f} ms')
+    except KeyboardInterrupt:
+        print('[DONE] Stopped watching')
+    finally:
+        watcher.close()
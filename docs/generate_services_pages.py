@@ -1,334 +1,17 @@
-#!/usr/bin/env python3
 """
-Generate all service module pages for Phase 5
-This script creates 40 pages (10 modules × 4 pages each)
+Generate all service module pages (list, create, edit and details).
+
+The code lives in crm_tools.generate_services_pages; this script is kept so existing
+invocations work. Same as `python -m crm_tools generate-services`.
 """
 
 import os
-import json
-
-# Module configurations
-MODULES = {
-    'guides': {
-        'singular': 'Guide',
-        'plural': 'Guides',
-        'icon': 'Users',
-        'description': 'Manage tour guides',
-        'has_city': False,
-        'has_image': True,
-        'key_field': 'guide_name',
-        'list_columns': ['guide_name', 'phone', 'email', 'languages', 'daily_rate', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Basic Information', 'fields': ['guide_name', 'phone', 'email']},
-            {'title': 'Languages & Specializations', 'fields': ['languages', 'specializations', 'license_number']},
-            {'title': 'Rates', 'fields': ['daily_rate', 'half_day_rate', 'night_rate', 'transfer_rate', 'currency']},
-            {'title': 'Additional', 'fields': ['profile_picture_url', 'notes', 'is_active']},
-        ]
-    },
-    'restaurants': {
-        'singular': 'Restaurant',
-        'plural': 'Restaurants',
-        'icon': 'UtensilsCrossed',
-        'description': 'Manage restaurants',
-        'has_city': True,
-        'has_image': True,
-        'key_field': 'restaurant_name',
-        'list_columns': ['restaurant_name', 'city', 'cuisine_type', 'lunch_price', 'dinner_price', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Basic Information', 'fields': ['restaurant_name', 'city_id', 'address', 'phone']},
-            {'title': 'Details', 'fields': ['cuisine_type', 'capacity', 'menu_options']},
-            {'title': 'Pricing', 'fields': ['lunch_price', 'dinner_price', 'currency']},
-            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
-        ]
-    },
-    'entrance-fees': {
-        'singular': 'Entrance Fee',
-        'plural': 'Entrance Fees',
-        'icon': 'Ticket',
-        'description': 'Manage entrance fees',
-        'has_city': True,
-        'has_image': True,
-        'key_field': 'site_name',
-        'list_columns': ['site_name', 'city', 'adult_price', 'child_price', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Basic Information', 'fields': ['site_name', 'city_id']},
-            {'title': 'Pricing', 'fields': ['adult_price', 'child_price', 'student_price', 'senior_price', 'currency']},
-            {'title': 'Visiting Information', 'fields': ['opening_hours', 'best_visit_time']},
-            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
-        ]
-    },
-    'extras': {
-        'singular': 'Extra Expense',
-        'plural': 'Extra Expenses',
-        'icon': 'DollarSign',
-        'description': 'Manage extra expenses',
-        'has_city': False,
-        'has_image': False,
-        'key_field': 'expense_name',
-        'list_columns': ['expense_name', 'expense_category', 'price', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Basic Information', 'fields': ['expense_name', 'expense_category']},
-            {'title': 'Pricing', 'fields': ['price', 'currency']},
-            {'title': 'Additional', 'fields': ['description', 'notes', 'is_active']},
-        ]
-    },
-    'vehicle-companies': {
-        'singular': 'Vehicle Company',
-        'plural': 'Vehicle Companies',
-        'icon': 'Building2',
-        'description': 'Manage vehicle companies',
-        'has_city': False,
-        'has_image': False,
-        'key_field': 'company_name',
-        'list_columns': ['company_name', 'contact_person', 'phone', 'email', 'is_active'],
-        'form_sections': [
-            {'title': 'Company Information', 'fields': ['company_name']},
-            {'title': 'Contact Details', 'fields': ['contact_person', 'phone', 'email']},
-            {'title': 'Additional', 'fields': ['notes', 'is_active']},
-        ]
-    },
-    'vehicle-types': {
-        'singular': 'Vehicle Type',
-        'plural': 'Vehicle Types',
-        'icon': 'Car',
-        'description': 'Manage vehicle types',
-        'has_city': False,
-        'has_image': False,
-        'key_field': 'vehicle_type',
-        'list_columns': ['vehicle_type', 'vehicle_company_id', 'capacity', 'luggage_capacity', 'is_active'],
-        'form_sections': [
-            {'title': 'Basic Information', 'fields': ['vehicle_company_id', 'vehicle_type']},
-            {'title': 'Capacity', 'fields': ['capacity', 'luggage_capacity']},
-            {'title': 'Additional', 'fields': ['notes', 'is_active']},
-        ]
-    },
-    'vehicle-rentals': {
-        'singular': 'Vehicle Rental',
-        'plural': 'Vehicle Rentals',
-        'icon': 'KeyRound',
-        'description': 'Manage vehicle rental pricing',
-        'has_city': False,
-        'has_image': False,
-        'key_field': 'vehicle_type_id',
-        'list_columns': ['vehicle_company_id', 'vehicle_type_id', 'full_day_price', 'half_day_price', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Vehicle Selection', 'fields': ['vehicle_company_id', 'vehicle_type_id']},
-            {'title': 'Full Day Rental', 'fields': ['full_day_price', 'full_day_hours', 'full_day_km']},
-            {'title': 'Half Day Rental', 'fields': ['half_day_price', 'half_day_hours', 'half_day_km']},
-            {'title': 'Night Rental', 'fields': ['night_rental_price', 'night_rental_hours', 'night_rental_km']},
-            {'title': 'Extra Charges', 'fields': ['extra_hour_rate', 'extra_km_rate', 'currency']},
-            {'title': 'Additional', 'fields': ['notes', 'is_active']},
-        ]
-    },
-    'transfer-routes': {
-        'singular': 'Transfer Route',
-        'plural': 'Transfer Routes',
-        'icon': 'Route',
-        'description': 'Manage transfer routes',
-        'has_city': False,
-        'has_image': False,
-        'key_field': 'from_city_id',
-        'list_columns': ['from_city_id', 'to_city_id', 'vehicle_company_id', 'price_per_vehicle', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Route Information', 'fields': ['vehicle_company_id', 'from_city_id', 'to_city_id', 'vehicle_type_id']},
-            {'title': 'Pricing & Details', 'fields': ['price_per_vehicle', 'currency', 'duration_hours', 'distance_km']},
-            {'title': 'Additional', 'fields': ['notes', 'is_active']},
-        ]
-    },
-    'tour-companies': {
-        'singular': 'Tour Company',
-        'plural': 'Tour Companies',
-        'icon': 'Flag',
-        'description': 'Manage tour companies',
-        'has_city': False,
-        'has_image': True,
-        'key_field': 'company_name',
-        'list_columns': ['company_name', 'tour_name', 'tour_type', 'duration_days', 'sic_price', 'currency', 'is_active'],
-        'form_sections': [
-            {'title': 'Company & Tour Information', 'fields': ['company_name', 'tour_name', 'tour_type']},
-            {'title': 'Duration', 'fields': ['duration_days', 'duration_hours']},
-            {'title': 'SIC Pricing', 'fields': ['sic_price', 'currency']},
-            {'title': 'Private Tour Pricing', 'fields': ['pvt_price_2_pax', 'pvt_price_4_pax', 'pvt_price_6_pax', 'pvt_price_8_pax', 'pvt_price_10_pax']},
-            {'title': 'Capacity', 'fields': ['min_passengers', 'max_passengers']},
-            {'title': 'Tour Details', 'fields': ['itinerary', 'inclusions', 'exclusions']},
-            {'title': 'Additional', 'fields': ['picture_url', 'notes', 'is_active']},
-        ]
-    },
-    'suppliers': {
-        'singular': 'Supplier',
-        'plural': 'Suppliers',
-        'icon': 'Package',
-        'description': 'Manage suppliers',
-        'has_city': True,
-        'has_image': False,
-        'key_field': 'company_name',
-        'list_columns': ['company_name', 'supplier_type', 'contact_person', 'phone', 'email', 'is_active'],
-        'form_sections': [
-            {'title': 'Company Information', 'fields': ['supplier_type', 'company_name']},
-            {'title': 'Contact Details', 'fields': ['contact_person', 'email', 'phone']},
-            {'title': 'Address', 'fields': ['address', 'city_id']},
-            {'title': 'Business Details', 'fields': ['tax_id', 'payment_terms', 'bank_account_info']},
-            {'title': 'Additional', 'fields': ['notes', 'is_active']},
-        ]
-    },
-}
-
-def generate_list_page(module_key, config):
-    """Generate list page for a module"""
-    hook_name = module_key.replace('-', '_')
-
-    return f'''// This file was auto-generated by generate_services_pages.py
-// Manual edits may be overwritten
-'use client';
-
-import {{ useState }} from 'react';
-import {{ use{config['singular'].replace(' ', '')}s }} from '@/hooks/use-{hook_name}';
-import {{ DataTable }} from '@/components/ui/data-table/DataTable';
-import {{ ColumnDef }} from '@tanstack/react-table';
-import {{ {config['singular'].replace(' ', '')} }} from '@/types/services';
-import {{ Button }} from '@/components/ui/button';
-import {{ Input }} from '@/components/ui/input';
-import {{ Plus, Search, Pencil, Eye, Trash2 }} from 'lucide-react';
-import Link from 'next/link';
-import {{ useRouter }} from 'next/navigation';
-import {{ StatusBadge }} from '@/components/shared/StatusBadge';
-import {{ ConfirmDialog }} from '@/components/shared/ConfirmDialog';
-import {{ Card, CardContent, CardHeader, CardTitle }} from '@/components/ui/card';
-
-export default function {config['plural'].replace(' ', '')}Page() {{
-  const router = useRouter();
-  const [search, setSearch] = useState('');
-  const [page, setPage] = useState(1);
-  const limit = 10;
-
-  const {{ {hook_name}: data, pagination, isLoading, delete{config['singular'].replace(' ', '')}: deleteItem, isDeleting }} = use{config['singular'].replace(' ', '')}s({{
-    page,
-    limit,
-    search: search || undefined,
-  }});
-
-  const columns: ColumnDef<{config['singular'].replace(' ', '')}>[] = [
-    {{
-      accessorKey: '{config['key_field']}',
-      header: '{config['key_field'].replace('_', ' ').title()}',
-    }},
-    {{
-      accessorKey: 'is_active',
-      header: 'Status',
-      cell: ({{ row }}) => (
-        <StatusBadge status={{row.original.is_active ? 'Active' : 'Inactive'}} />
-      ),
-    }},
-    {{
-      id: 'actions',
-      header: 'Actions',
-      cell: ({{ row }}) => (
-        <div className="flex items-center gap-2">
-          <Button
-            variant="ghost"
-            size="sm"
-            onClick={{() => router.push(`/dashboard/services/{module_key}/${{row.original.id}}`)}}
-          >
-            <Eye className="h-4 w-4" />
-          </Button>
-          <Button
-            variant="ghost"
-            size="sm"
-            onClick={{() => router.push(`/dashboard/services/{module_key}/${{row.original.id}}/edit`)}}
-          >
-            <Pencil className="h-4 w-4" />
-          </Button>
-          <ConfirmDialog
-            title="Delete {config['singular']}"
-            description="Are you sure you want to delete this {config['singular'].lower()}? This action cannot be undone."
-            onConfirm={{() => deleteItem(row.original.id)}}
-            trigger={{
-              <Button variant="ghost" size="sm" disabled={{isDeleting}}>
-                <Trash2 className="h-4 w-4 text-red-600" />
-              </Button>
-            }}
-          />
-        </div>
-      ),
-    }},
-  ];
-
-  return (
-    <div className="space-y-6">
-      <div className="flex items-center justify-between">
-        <div>
-          <h1 className="text-3xl font-bold text-gray-900">{config['plural']}</h1>
-          <p className="text-gray-600">{config['description']}</p>
-        </div>
-        <Link href="/dashboard/services/{module_key}/create">
-          <Button>
-            <Plus className="h-4 w-4 mr-2" />
-            Add {config['singular']}
-          </Button>
-        </Link>
-      </div>
-
-      <Card>
-        <CardHeader>
-          <CardTitle>Search & Filter</CardTitle>
-        </CardHeader>
-        <CardContent>
-          <div className="flex gap-4">
-            <div className="flex-1">
-              <div className="relative">
-                <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-gray-400 h-4 w-4" />
-                <Input
-                  placeholder="Search {config['plural'].lower()}..."
-                  value={{search}}
-                  onChange={{(e) => setSearch(e.target.value)}}
-                  className="pl-10"
-                />
-              </div>
-            </div>
-          </div>
-        </CardContent>
-      </Card>
-
-      <Card>
-        <CardContent className="pt-6">
-          <DataTable
-            columns={{columns}}
-            data={{data}}
-            pageCount={{pagination?.totalPages || 0}}
-            currentPage={{page}}
-            onPageChange={{setPage}}
-            isLoading={{isLoading}}
-          />
-        </CardContent>
-      </Card>
-    </div>
-  );
-}}
-'''
-
-def main():
-    """Generate all service pages"""
-    base_path = r'C:\Users\fatih\Desktop\CRM\frontend\src\app\(dashboard)\dashboard\services'
-
-    for module_key, config in MODULES.items():
-        module_path = os.path.join(base_path, module_key)
-
-        # Create directories
-        os.makedirs(module_path, exist_ok=True)
-        os.makedirs(os.path.join(module_path, 'create'), exist_ok=True)
-        os.makedirs(os.path.join(module_path, '[id]'), exist_ok=True)
-
-        # Generate list page
-        list_content = generate_list_page(module_key, config)
-        with open(os.path.join(module_path, 'page.tsx'), 'w', encoding='utf-8') as f:
-            f.write(list_content)
+import sys
 
-        print(f'[OK] Created {module_key}/page.tsx (list)')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-        # Note: Create/Edit/Details pages would be generated similarly
-        # Due to length constraints, showing pattern for list page only
-        # Full implementation would include all 4 pages per module
+from crm_tools.generate_services_pages import *
+from crm_tools.generate_services_pages import main
 
 if __name__ == '__main__':
-    main()
-    print('\\n[OK] All service pages generated successfully!')
+    sys.exit(main())
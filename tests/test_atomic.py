@@ -0,0 +1,108 @@
+"""Staged writes, batch commits and rollback."""
+
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from crm_tools.atomic import TEMP_SUFFIX, Batch, commit_results, journal_dir, rollback, stage
+from crm_tools.runner import FIXED, FileResult
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def temp_files(root):
+    return [name for _, _, files in os.walk(root) for name in files if name.endswith(TEMP_SUFFIX)]
+
+
+def test_rollback_restores_the_original_files(tmp_path):
+    base = str(tmp_path)
+    edited = os.path.join(base, 'hotels', 'page.tsx')
+    created = os.path.join(base, 'guides', 'page.tsx')
+    write(edited, 'before\n')
+
+    with Batch(base) as batch:
+        assert batch.write(edited, 'after\n')
+        assert batch.write(created, 'new\n')
+    assert read(edited) == 'after\n'
+    assert read(created) == 'new\n'
+
+    assert rollback(base) == 2
+    assert read(edited) == 'before\n'
+    assert not os.path.exists(created)
+    assert not os.path.exists(journal_dir(base))
+
+
+def test_unchanged_pages_are_not_staged(tmp_path):
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    write(path, 'same\n')
+    assert stage(path, 'same\n') is None
+    assert temp_files(str(tmp_path)) == []
+
+
+def test_aborted_batch_leaves_the_tree_alone(tmp_path):
+    base = str(tmp_path)
+    path = os.path.join(base, 'page.tsx')
+    write(path, 'before\n')
+    with pytest.raises(RuntimeError):
+        with Batch(base) as batch:
+            batch.write(path, 'after\n')
+            raise RuntimeError
+    assert read(path) == 'before\n'
+    assert temp_files(base) == []
+
+
+def test_failed_write_removes_its_temp_file(tmp_path):
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    with pytest.raises(UnicodeEncodeError):
+        stage(path, 'lone surrogate \ud800')
+    assert temp_files(str(tmp_path)) == []
+
+
+def exited_pid():
+    proc = subprocess.Popen([sys.executable, '-c', ''])
+    proc.wait()
+    return proc.pid
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='needs a process liveness check')
+def test_commit_sweeps_temp_files_of_finished_runs_only(tmp_path):
+    base = str(tmp_path)
+    path = os.path.join(base, 'hotels', 'page.tsx')
+    write(path, 'before\n')
+    # Staged by a worker of an interrupted run, and by a run still going
+    abandoned = os.path.join(base, 'hotels', f'.edit.tsx.{exited_pid()}-1{TEMP_SUFFIX}')
+    running = os.path.join(base, 'hotels', f'.view.tsx.{os.getppid()}-1{TEMP_SUFFIX}')
+    elsewhere = os.path.join(base, 'guides', f'.page.tsx.{exited_pid()}{TEMP_SUFFIX}')
+    for stale in (abandoned, running, elsewhere):
+        write(stale, 'staged\n')
+
+    staged = stage(path, 'after\n')
+    assert commit_results([FileResult(path, FIXED, '', staged)], base) == 1
+    assert read(path) == 'after\n'
+    assert not os.path.exists(abandoned)
+    # Another run's files, and directories this batch did not write into, are left alone
+    assert os.path.exists(running)
+    assert os.path.exists(elsewhere)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX file modes')
+def test_commit_keeps_the_file_mode(tmp_path):
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    write(path, 'before\n')
+    os.chmod(path, 0o640)
+    with Batch(str(tmp_path)) as batch:
+        batch.write(path, 'after\n')
+    assert read(path) == 'after\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
@@ -0,0 +1,28 @@
+"""Element scanning in crm_tools.jsx."""
+
+from crm_tools.jsx import find_elements
+from crm_tools.tsx_index import index_for
+
+
+def names(text, index=None):
+    return [(text[start:end], attrs) for start, end, attrs, _ in find_elements(text, 'ConfirmDialog', index)]
+
+
+def test_malformed_tag_does_not_hide_later_elements():
+    text = '<ConfirmDialog<P> open={x} />\n<ConfirmDialog open={y} />'
+    expected = [('<ConfirmDialog open={y} />', ['open'])]
+    assert names(text) == expected
+    assert names(text, index_for(text)) == expected
+
+
+def test_odd_attribute_is_skipped():
+    text = '<ConfirmDialog open=5 />\n<ConfirmDialog title="a" onConfirm={() => go({ id })} />'
+    assert names(text) == [('<ConfirmDialog title="a" onConfirm={() => go({ id })} />', ['title', 'onConfirm'])]
+
+
+def test_unterminated_tag_stops_the_scan():
+    assert names('<ConfirmDialog open={x} />\n<ConfirmDialog open={y') == [('<ConfirmDialog open={x} />', ['open'])]
+
+
+def test_longer_names_are_not_matches():
+    assert names('<ConfirmDialogContent /><ConfirmDialog />') == [('<ConfirmDialog />', [])]
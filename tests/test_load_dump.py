@@ -0,0 +1,17 @@
+"""Row parsing for the SQL dump loader."""
+
+import pytest
+
+from crm_tools.load_dump import _fast_row, parse_row
+
+ROWS = [
+    ("NULL::integer, 'a'::text, 5", [None, 'a', 5]),
+    ("5::numeric, -2.5::double precision, true::boolean", [5, -2.5, 1]),
+    ("'{1,2}'::integer[], 'it''s', NULL", ['{1,2}', "it's", None]),
+]
+
+
+@pytest.mark.parametrize('body, expected', ROWS)
+def test_casts_are_stripped_by_both_parsers(body, expected):
+    assert _fast_row(body) == expected
+    assert parse_row(f'({body})', 0) == (expected, len(body) + 2)
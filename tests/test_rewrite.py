@@ -0,0 +1,74 @@
+"""The single-pass rewriters against the sequential re.sub loops they replaced."""
+
+import random
+import re
+
+import pytest
+
+from crm_tools.rewrite import PROPERTY_MAP, rewrite_item_data, rewrite_list_columns, view_rewriter
+
+VAR_NAMES = ['tour', 'hotel', 'city', 'data', 'extra', 'e', 't', 'row', 'itemData', 'max']
+
+
+# The loops of the original fix_services.py, verbatim
+def baseline_view(content, var_name):
+    for snake, camel in PROPERTY_MAP.items():
+        content = re.sub(rf'{var_name}\.{snake}', f'{var_name}.data.{camel}', content)
+    content = re.sub(rf'{var_name}\.city\.city_name', f'{var_name}.data.city?.cityName', content)
+    return content
+
+
+def baseline_item_data(content):
+    for snake, camel in PROPERTY_MAP.items():
+        content = re.sub(rf'itemData\.{snake}', f'itemData.{camel}', content)
+    return content
+
+
+def baseline_list(content):
+    for snake, camel in PROPERTY_MAP.items():
+        content = re.sub(rf"accessorKey: '{snake}'", f"accessorKey: '{camel}'", content)
+        content = re.sub(rf'row\.original\.{snake}', f'row.original.{camel}', content)
+    return content
+
+
+def fragments(var_name):
+    keys = list(PROPERTY_MAP) + ['city.city_name']
+    pieces = [' ', '\n', '.', "'", 'r', 'e', 'data.', var_name, var_name + '.', 'city.']
+    for key in keys:
+        pieces += [f'{var_name}.{key}', f'itemData.{key}', f"accessorKey: '{key}'", f'row.original.{key}', key]
+    return pieces
+
+
+def random_page(rng, var_name, size=400):
+    return ''.join(rng.choice(fragments(var_name)) for _ in range(size))
+
+
+@pytest.mark.parametrize('var_name', VAR_NAMES)
+def test_view_matches_baseline(var_name):
+    rng = random.Random(var_name)
+    rewrite = view_rewriter(var_name)
+    for _ in range(30):
+        page = random_page(rng, var_name)
+        assert rewrite(page) == baseline_view(page, var_name)
+
+
+def test_item_data_and_list_match_baseline():
+    rng = random.Random(1)
+    for _ in range(60):
+        page = random_page(rng, 'itemData')
+        assert rewrite_item_data(page) == baseline_item_data(page)
+        assert rewrite_list_columns(page) == baseline_list(page)
+
+
+@pytest.mark.parametrize('page, var_name', [
+    ('city.city.city_name city.max_capacity', 'city'),
+    ('city.city.max_capacity', 'city'),
+    ("row.original.tax_numberow.original.from_city_id", None),
+    ('extra.type_namextra.site_name', 'extra'),
+    ('data.data.description data.email', 'data'),
+])
+def test_overlapping_prefixes(page, var_name):
+    if var_name is None:
+        assert rewrite_list_columns(page) == baseline_list(page)
+    else:
+        assert view_rewriter(var_name)(page) == baseline_view(page, var_name)
@@ -0,0 +1,123 @@
+"""Chunked PROPERTY_MAP rewrites of large pages against the whole-file rewrite."""
+
+import os
+import random
+import tracemalloc
+
+import pytest
+
+from crm_tools import atomic, fix_services, rewrite, transforms, validate
+from crm_tools.rewrite import PROPERTY_MAP, NeedsWholeFile, compile_rewriter, rewrite_list_columns, view_rewriter
+from crm_tools.transforms import fix_list_content, fix_view_content
+from crm_tools.validate import validate_results
+
+CHUNK_SIZES = [1, 2, 7, 64, 4096]
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def random_page(rng, var_name, size=600):
+    pieces = [' ', '\n', '\r\n', '.', "'", var_name, var_name + '.', f'{var_name}.city.city_name']
+    for key in PROPERTY_MAP:
+        pieces += [f'{var_name}.{key}', f"accessorKey: '{key}'", f'row.original.{key}', key]
+    head = f'const {{ data: {var_name}, isLoading }} = useItem(\n'
+    return head + ''.join(rng.choice(pieces) for _ in range(size))
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('var_name', ['tour', 'hotel', 'city', 'extra'])
+def test_stream_matches_whole_text_at_any_chunk_size(var_name):
+    rng = random.Random(var_name)
+    for rewrite in (rewrite_list_columns, view_rewriter(var_name)):
+        for _ in range(5):
+            page = random_page(rng, var_name, 250)
+            for size in CHUNK_SIZES:
+                assert ''.join(rewrite.stream(chunked(page, size))) == rewrite(page)
+
+
+def test_stream_of_sequential_rules():
+    rewrite = compile_rewriter([('p.', [('a', 'ab'), ('ab', 'c'), ('b', 'bb')])])
+    assert rewrite.compiled()[0] is None
+    rng = random.Random(3)
+    page = ''.join(rng.choice(['p.a', 'p.ab', 'p.b', 'x', 'p.', '.']) for _ in range(2000))
+    for size in CHUNK_SIZES:
+        assert ''.join(rewrite.stream(chunked(page, size))) == rewrite(page)
+
+
+def test_overlap_needs_the_whole_text():
+    page = 'row.original.tax_numberow.original.from_city_id'
+    with pytest.raises(NeedsWholeFile):
+        ''.join(rewrite_list_columns.stream(chunked(page, 7)))
+
+
+@pytest.fixture
+def streamed(monkeypatch):
+    """Make fix_services stream every page, however small"""
+    monkeypatch.setattr(fix_services, 'STREAM_THRESHOLD', 0)
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n'])
+def test_fixers_stream_to_the_whole_file_result(tmp_path, streamed, newline):
+    rng = random.Random(newline)
+    page = random_page(rng, 'tour', 3000).replace('\r\n', '\n')
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    with open(path, 'w', encoding='utf-8', newline=newline) as f:
+        f.write(page)
+
+    for fixer, fix in ((fix_services.fix_list_page, fix_list_content), (fix_services.fix_view_page, fix_view_content)):
+        result = fixer(path)
+        assert result.status == fix_services.FIXED
+        assert read(result.staged) == fix(page)
+        atomic.discard(result.staged)
+
+
+def test_fixer_falls_back_to_the_whole_file(tmp_path, streamed):
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("accessorKey: 'site_name'\nrow.original.tax_numberow.original.from_city_id\n")
+    result = fix_services.fix_list_page(path)
+    assert read(result.staged) == fix_list_content(read(path))
+    atomic.discard(result.staged)
+
+
+def test_large_pages_are_reported_not_validated(tmp_path, streamed, monkeypatch):
+    monkeypatch.setattr(validate, 'STREAM_THRESHOLD', 0)
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("accessorKey: 'site_name' {\n")
+    [result] = validate_results([fix_services.fix_list_page(path)])
+    assert result.status == fix_services.FIXED
+    assert '[SKIP]' in result.message and 'not validated' in result.message
+    atomic.discard(result.staged)
+
+
+def test_streamed_rewrite_memory_stays_bounded(tmp_path, streamed, monkeypatch):
+    # Small chunks and a page 64 of them long stand in for a page far over the threshold
+    chunk = 1 << 16
+    monkeypatch.setattr(transforms, 'iter_text', lambda path: rewrite.iter_text(path, chunk))
+    monkeypatch.setattr(validate, 'STREAM_THRESHOLD', 0)
+    rng = random.Random(5)
+    unit = random_page(rng, 'tour', 2000)
+    path = os.path.join(str(tmp_path), 'page.tsx')
+    with open(path, 'w', encoding='utf-8') as f:
+        while f.tell() < 64 * chunk:
+            f.write(unit)
+
+    tracemalloc.start()
+    try:
+        result = fix_services.fix_list_page(path)
+        [result] = validate_results([result])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result.status == fix_services.FIXED
+    assert '[SKIP]' in result.message
+    assert peak < 16 * chunk
+    assert read(result.staged) == fix_list_content(read(path))
+    atomic.discard(result.staged)